@@ -1,14 +1,16 @@
 import tkinter as tk
 import tk_tools
+import random
 
 root = tk.Tk()
 
-label_grid = tk_tools.LabelGrid(root, 3, ['Column0', 'Column1', 'Column2'])
+label_grid = tk_tools.LabelGrid(root, 3, ['Column0', 'Column1', 'Column2'],
+                                sortable=True, filter_box=True)
 label_grid.grid(row=0, column=0)
 
 
 def add_row():
-    row = [1, 2, 3]
+    row = [random.randint(0, 10) for _ in range(3)]
     label_grid.add_row(row)
 
 
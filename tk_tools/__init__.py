@@ -1,9 +1,13 @@
 from tk_tools.canvas import Dial, RotaryScale, Graph, Led
 from tk_tools.groups import EntryGrid, LabelGrid, \
-    KeyValueEntry, SpreadSheetReader, ButtonGrid, \
-    Calendar
-from tk_tools.widgets import SmartOptionMenu, SmartSpinBox, \
-    SmartCheckbutton, ByteLabel
+    KeyValueEntry, ScrollableKeyValueEntry, SpreadSheetReader, \
+    ButtonGrid, Calendar, YearCalendar
+from tk_tools.readers import ReaderBackend, XlrdBackend, \
+    OpenpyxlBackend, CsvBackend, ColumnarCacheBackend
+from tk_tools.sources import DataSource, ListSource, CsvSource, \
+    SqliteSource, CachedSource
+from tk_tools.widgets import SmartOptionMenu, SmartSearchMenu, \
+    SmartSpinBox, SmartCheckbutton, ByteLabel, batch_updates
 
 from tk_tools.version import __version__
 
@@ -11,7 +15,12 @@ from tk_tools.version import __version__
 __all__ = [
     'Dial', 'RotaryScale', 'Graph', 'Led',
     'EntryGrid', 'LabelGrid', 'ButtonGrid', 'KeyValueEntry',
-    'SpreadSheetReader', 'SmartOptionMenu', 'SmartSpinBox',
-    'SmartCheckbutton', 'Calendar', 'ByteLabel',
+    'ScrollableKeyValueEntry',
+    'SpreadSheetReader', 'SmartOptionMenu', 'SmartSearchMenu', 'SmartSpinBox',
+    'SmartCheckbutton', 'Calendar', 'YearCalendar', 'ByteLabel',
+    'batch_updates',
+    'ReaderBackend', 'XlrdBackend', 'OpenpyxlBackend', 'CsvBackend',
+    'ColumnarCacheBackend',
+    'DataSource', 'ListSource', 'CsvSource', 'SqliteSource', 'CachedSource',
     '__version__'
 ]
@@ -2,10 +2,20 @@ import tkinter as tk
 import tkinter.ttk as ttk
 from tkinter.font import Font
 import datetime
+import functools
+import array
+import bisect
 import calendar
+import csv
+import itertools
+import os
+import queue
+import threading
+import re
 from collections import OrderedDict
 
-import xlrd
+from tk_tools.readers import backend_for, ColumnarCacheBackend
+from tk_tools.sources import DataSource, CachedSource
 
 
 class Grid(tk.Frame):
@@ -28,6 +38,11 @@ class Grid(tk.Frame):
         self.rows = list()
         self.num_of_columns = num_of_columns
 
+        self.source = None
+        self.first_row = 0
+        self._window_text = None
+        self._scrollbar = None
+
         # do some validation
         if headers:
             if len(headers) != num_of_columns:
@@ -58,11 +73,19 @@ class Grid(tk.Frame):
             for widget in row:
                 widget.grid_forget()
 
-        offset = 0 if not self.headers else 1
+        offset = self._row_offset()
         for i, row in enumerate(self.rows):
             for j, widget in enumerate(row):
                 widget.grid(row=i+offset, column=j)
 
+    def _row_offset(self):
+        r"""
+        The grid row on which the first row of data is placed
+
+        :return: the number of grid rows above the data
+        """
+        return 0 if not self.headers else 1
+
     def remove_row(self, row_number: int=-1):
         r"""
         Removes a specified row of data
@@ -86,23 +109,282 @@ class Grid(tk.Frame):
         for i in range(len(self.rows)):
             self.remove_row(0)
 
+    def set_source(self, source: DataSource, visible_rows: int=20,
+                   block_size: int=256, max_blocks: int=64):
+        r"""
+        Display the rows of a data source rather than rows added with \
+        ``add_row``.  Only ``visible_rows`` rows of widgets are created; \
+        scrolling fetches the rows being displayed from the source, \
+        through a cache of recently fetched blocks of rows, and writes \
+        them into the existing widgets.  The window only displays the \
+        source: the cells of an ``EntryGrid`` are read-only, and a \
+        ``LabelGrid`` cannot be sorted or filtered.::
+
+            grid = LabelGrid(root, 3, ['time', 'channel', 'value'])
+            grid.set_source(SqliteSource('log.db', 'samples'),
+                            visible_rows=25)
+
+        :param source: a ``DataSource``, or an object with ``len()`` and \
+        ``rows(start, stop)``
+        :param visible_rows: the number of rows displayed
+        :param block_size: the number of rows fetched at once
+        :param max_blocks: the number of fetched blocks kept in memory
+        :return: None
+        """
+        self.clear()
+
+        if not isinstance(source, CachedSource):
+            source = CachedSource(source, block_size=block_size,
+                                  max_blocks=max_blocks)
+        self.source = source
+
+        self.allocate_window(visible_rows)
+
+        if self._scrollbar is None:
+            self._scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL,
+                                           command=self._scrollbar_moved)
+            tag = 'GridWindow{}'.format(id(self))
+            self.bind_class(tag, '<MouseWheel>', self._mouse_wheel)
+            self.bind_class(tag, '<Button-4>', lambda e: self.scroll(-3))
+            self.bind_class(tag, '<Button-5>', lambda e: self.scroll(3))
+            self._window_tag = tag
+
+        for row in self.rows:
+            for widget in row:
+                widget.bindtags(widget.bindtags() + (self._window_tag,))
+
+        self._scrollbar.grid(row=self._row_offset(),
+                             column=self.num_of_columns,
+                             rowspan=max(visible_rows, 1), sticky='N,S')
+
+        self.first_row = 0
+        self.scroll_to(0)
+
+    def scroll_to(self, first_row: int):
+        r"""
+        Display the rows of the data source starting at ``first_row``
+
+        :param first_row: the index of the first row to display
+        :return: None
+        """
+        visible = len(self.rows)
+        first_row = max(0, first_row)
+
+        # the length of the source is only estimated until the end is
+        # reached, so that a large source is not counted up front
+        data = self.source.rows(first_row, first_row + visible)
+        if len(data) < visible and first_row > 0:
+            first_row = max(0, len(self.source) - visible)
+            data = self.source.rows(first_row, first_row + visible)
+
+        self.first_row = first_row
+        self.fill_window(data)
+
+        total = max(self.source.length_hint(), first_row + len(data))
+        if total:
+            self._scrollbar.set(first_row / total,
+                                min(first_row + visible, total) / total)
+        else:
+            self._scrollbar.set(0, 1)
+
+    def scroll(self, rows: int):
+        r"""
+        Move the displayed rows of the data source
+
+        :param rows: the number of rows to move by (negative moves up)
+        :return: None
+        """
+        self.scroll_to(self.first_row + rows)
+
+    def refresh_source(self):
+        r"""
+        Discard cached rows and display the data source again; use \
+        after the underlying data has changed.
+
+        :return: None
+        """
+        self.source.invalidate()
+        self.scroll_to(self.first_row)
+
+    def _scrollbar_moved(self, action, amount, unit=None):
+        if action == tk.MOVETO:
+            self.scroll_to(int(float(amount) * self.source.length_hint()))
+        elif unit == tk.PAGES:
+            self.scroll(int(amount) * len(self.rows))
+        else:
+            self.scroll(int(amount))
+
+    def _mouse_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def _new_cell(self, column: int):
+        r"""
+        Create a widget for a row allocated by ``set_source``
+
+        :param column: the column of the widget
+        :return: the new widget
+        """
+        raise NotImplementedError
+
+    def _set_cell_text(self, widget, text: str):
+        raise NotImplementedError
+
+    def allocate_window(self, num_of_rows: int):
+        r"""
+        Create rows of empty cells which are re-used to display data; \
+        used by ``set_source``, or to display pages of data written with \
+        :meth:`fill_window` rather than rows added one at a time.
+
+        :param num_of_rows: the number of rows to create
+        :return: None
+        """
+        offset = self._row_offset()
+        for i in range(len(self.rows), num_of_rows):
+            row = list()
+            for j in range(self.num_of_columns):
+                widget = self._new_cell(j)
+                widget.grid(row=i + offset, column=j, sticky='E,W')
+                row.append(widget)
+
+            self.rows.append(row)
+
+        self._window_text = [[''] * self.num_of_columns for _ in self.rows]
+
+    def fill_window(self, data: list):
+        r"""
+        Write rows of data into the cells created by \
+        :meth:`allocate_window`, changing only the cells whose text \
+        differs from what they display.
+
+        :param data: the rows to display; missing rows are left blank
+        :return: None
+        """
+        for i, row in enumerate(self.rows):
+            values = data[i] if i < len(data) else ()
+            shown = self._window_text[i]
+
+            for j, widget in enumerate(row):
+                value = values[j] if j < len(values) else None
+                text = '' if value is None else str(value)
+
+                if text != shown[j]:
+                    self._set_cell_text(widget, text)
+                    shown[j] = text
+
+
+def _regex_validator(pattern):
+    r"""
+    Create a validator which requires the whole text to match a pattern
+
+    :param pattern: a regular expression, as a string or compiled
+    :return: a callable returning the text or raising ``ValueError``
+    """
+    pattern = re.compile(pattern)
+
+    def validator(text):
+        if pattern.fullmatch(text) is None:
+            raise ValueError('{!r} does not match {!r}'.format(
+                text, pattern.pattern))
+        return text
+
+    return validator
+
+
+def _sort_key(value):
+    r"""
+    Key used to sort grid values; numbers (or numeric strings) sort \
+    numerically and ahead of any other text.
+
+    :param value: the cell value
+    :return: a tuple which is comparable regardless of the value type
+    """
+    if isinstance(value, (int, float)):
+        return 0, value, ''
+
+    try:
+        return 0, float(value), ''
+    except (TypeError, ValueError):
+        return 1, 0, str(value)
+
 
 class LabelGrid(Grid):
     r"""
     A table-like display widget.
 
+    Rows may be sorted and filtered without being re-created; the \
+    existing row widgets are simply re-gridded in the new order.  Sort \
+    indexes are built per column on first use and discarded whenever \
+    the data they were built from is written.::
+
+        label_grid = LabelGrid(root, 3, ['a', 'b', 'c'],
+                               sortable=True, filter_box=True)
+        label_grid.add_row([3, 'three', 3.0])
+        label_grid.sort(0, descending=True)
+        label_grid.set_filter(lambda row: row[0] > 1)
+
     :param parent: the tk parent element of this frame
     :param num_of_columns: the number of columns contained of the grid
     :param headers: a list containing the names of the column headers
+    :param sortable: if True, clicking a header sorts by that column
+    :param filter_box: if True, an entry is shown above the headers \
+    which filters the rows on the text typed into it
     """
     def __init__(self, parent,
                  num_of_columns: int, headers: list=None,
+                 sortable: bool=False, filter_box: bool=False,
                  **options):
         super().__init__(parent, num_of_columns, headers, **options)
 
+        self._values = list()
+        self._order = list()
+        self._sort_indexes = dict()
+        self._sort_column = None
+        self._sort_descending = False
+        self._filter = None
+        self._filter_text = None
+
+        self.filter_entry = None
+        if filter_box:
+            self.filter_entry = tk.Entry(self)
+            self.filter_entry.grid(row=0, column=0,
+                                   columnspan=num_of_columns, sticky='E,W')
+            self.filter_entry.bind(
+                '<KeyRelease>',
+                lambda e: self.filter_text(self.filter_entry.get())
+            )
+
+            for i, label in enumerate(self.headers):
+                label.grid(row=1, column=i, sticky='E,W')
+
+        if sortable:
+            for i, label in enumerate(self.headers):
+                label.bind('<Button-1>',
+                           lambda e, column=i: self._header_clicked(column))
+
+    def _row_offset(self):
+        offset = super()._row_offset()
+        return offset if self.filter_entry is None else offset + 1
+
+    def set_source(self, source: DataSource, visible_rows: int=20,
+                   block_size: int=256, max_blocks: int=64):
+        super().set_source(source, visible_rows=visible_rows,
+                           block_size=block_size, max_blocks=max_blocks)
+
+        # the rows of a source are not held here to be sorted or filtered
+        if self.filter_entry is not None:
+            self.filter_entry.delete(0, tk.END)
+            self.filter_entry.config(state=tk.DISABLED)
+
+    def _check_no_source(self):
+        if self.source is not None:
+            raise RuntimeError('the rows of a data source cannot be '
+                               'sorted or filtered')
+
     def add_row(self, data: list):
         r"""
-        Add a row of data to the current widget
+        Add a row of data to the current widget.  The new row is placed \
+        at the bottom of the grid; call :meth:`refresh` to re-apply the \
+        current sort.
 
         :param data: a row of data
         :return: None
@@ -112,30 +394,273 @@ class LabelGrid(Grid):
             if len(self.headers) != len(data):
                 raise ValueError
 
-        offset = 0 if not self.headers else 1
+        visible = self._filter is None or self._filter(data)
+        offset = self._row_offset()
         row = list()
         for i, element in enumerate(data):
             label = tk.Label(self, text=str(element), relief=tk.GROOVE,
                              padx=self.padding, pady=self.padding)
-            label.grid(row=len(self.rows) + offset, column=i, sticky='E,W')
+            if visible:
+                label.grid(row=len(self._order) + offset, column=i,
+                           sticky='E,W')
             row.append(label)
 
+        if visible:
+            self._order.append(len(self.rows))
+
         self.rows.append(row)
+        self._values.append(list(data))
+        self._sort_indexes.clear()
+
+    def remove_row(self, row_number: int=-1):
+        r"""
+        Removes a specified row of data
+
+        :param row_number: the row to remove (defaults to the last row), \
+        counted in the order in which rows were added
+        :return: None
+        """
+        if len(self.rows) == 0:
+            return
+
+        row_id = range(len(self.rows))[row_number]
+        super().remove_row(row_id)
+        self._values.pop(row_id)
+        self._sort_indexes.clear()
+
+        # rows displayed above the removed row keep their place
+        position = len(self._order)
+        if row_id in self._order:
+            position = self._order.index(row_id)
+
+        self._order = [i - 1 if i > row_id else i
+                       for i in self._order if i != row_id]
+        self._place(self._order[position:], start=position)
+
+    def clear(self):
+        r"""
+        Removes all elements of the grid
+
+        :return: None
+        """
+        for row in self.rows:
+            for widget in row:
+                widget.destroy()
+
+        self.rows = list()
+        self._values = list()
+        self._order = list()
+        self._sort_indexes.clear()
+
+    def set_value(self, row: int, column: int, value):
+        r"""
+        Change the value of a single cell.  The rows are not re-sorted \
+        or re-filtered until :meth:`refresh` is called.
+
+        :param row: the row, counted in the order in which rows were added
+        :param column: the column
+        :param value: the new value
+        :return: None
+        """
+        self._values[row][column] = value
+        self.rows[row][column].config(text=str(value))
+        self._sort_indexes.pop(column, None)
+
+    def sort(self, column: int=None, descending: bool=False):
+        r"""
+        Display the rows sorted by the values in a column.
+
+        :param column: the column to sort by; None restores the order \
+        in which the rows were added
+        :param descending: True to sort from the largest value
+        :return: None
+        """
+        self._check_no_source()
+        self._sort_column = column
+        self._sort_descending = descending
+        self.refresh()
+
+    def set_filter(self, predicate: callable=None):
+        r"""
+        Display only the rows for which ``predicate(row_data)`` is True.
+
+        :param predicate: a callable receiving the list of row values; \
+        None displays all rows
+        :return: None
+        """
+        self._check_no_source()
+        self._filter = predicate
+        self._filter_text = None
+        self.refresh()
+
+    def filter_text(self, text: str):
+        r"""
+        Display only the rows in which any cell contains ``text`` \
+        (case insensitive).  When ``text`` extends the previous filter \
+        text, only the rows currently displayed are searched.
+
+        :param text: the text to search for; an empty string clears \
+        the filter
+        :return: None
+        """
+        self._check_no_source()
+        text = text.lower()
+        previous = self._filter_text
+
+        if not text:
+            self.set_filter(None)
+            return
+
+        def predicate(row_data):
+            return any(text in str(value).lower() for value in row_data)
+
+        if previous is not None and text.startswith(previous):
+            order = [i for i in self._order if predicate(self._values[i])]
+        else:
+            order = [i for i in self._sorted_ids()
+                     if predicate(self._values[i])]
+
+        self._filter = predicate
+        self._filter_text = text
+        self._show(order)
+
+    def refresh(self):
+        r"""
+        Re-apply the current sort and filter to all rows.
+
+        :return: None
+        """
+        self._check_no_source()
+        order = self._sorted_ids()
+
+        if self._filter is not None:
+            order = [i for i in order if self._filter(self._values[i])]
+
+        self._show(order)
+
+    def _new_cell(self, column: int):
+        return tk.Label(self, relief=tk.GROOVE,
+                        padx=self.padding, pady=self.padding)
+
+    def _set_cell_text(self, widget, text: str):
+        widget.config(text=text)
+
+    def _header_clicked(self, column: int):
+        if self.source is not None:
+            return
+
+        descending = False
+        if column == self._sort_column:
+            descending = not self._sort_descending
+
+        self.sort(column, descending=descending)
+
+    def _sort_index(self, column: int):
+        r"""
+        The row ids ordered by the values in ``column``, built on \
+        first use and cached until the column is written.
+
+        :param column: the column
+        :return: a list of row ids
+        """
+        index = self._sort_indexes.get(column)
+        if index is None:
+            index = sorted(range(len(self._values)),
+                           key=lambda i: _sort_key(self._values[i][column]))
+            self._sort_indexes[column] = index
+
+        return index
+
+    def _sorted_ids(self):
+        if self._sort_column is None:
+            return list(range(len(self.rows)))
+
+        index = self._sort_index(self._sort_column)
+        if self._sort_descending:
+            return index[::-1]
+
+        return list(index)
+
+    def _show(self, order: list):
+        r"""
+        Re-grid the existing row widgets so that the rows in ``order`` \
+        are displayed, in that order, and all others are hidden.
+
+        :param order: the row ids to display
+        :return: None
+        """
+        previous = {row_id: i for i, row_id in enumerate(self._order)}
+        shown = set(order)
+
+        for row_id in self._order:
+            if row_id not in shown:
+                for widget in self.rows[row_id]:
+                    widget.grid_remove()
+
+        offset = self._row_offset()
+        for position, row_id in enumerate(order):
+            if previous.get(row_id) != position:
+                for j, widget in enumerate(self.rows[row_id]):
+                    widget.grid(row=position + offset, column=j,
+                                sticky='E,W')
+
+        self._order = order
+
+    def _place(self, row_ids: list, start: int=0):
+        offset = self._row_offset() + start
+        for position, row_id in enumerate(row_ids):
+            for j, widget in enumerate(self.rows[row_id]):
+                widget.grid(row=position + offset, column=j, sticky='E,W')
 
 
 class EntryGrid(Grid):
     r"""
     Add a spreadsheet-like grid of entry widgets.
 
+    Columns may be given a validator, which is one of ``int``, \
+    ``float``, a regular expression (string or compiled) which must \
+    match the whole cell, or any callable which converts the cell text \
+    and raises ``ValueError`` or ``TypeError`` if it is invalid.  Only \
+    cells which have been edited or inserted are re-validated, and \
+    invalid cells are highlighted.::
+
+        entry_grid = EntryGrid(root, 2, ['count', 'part'],
+                               validators={0: int, 1: r'[A-Z]{2}\d+'})
+        ...
+        if entry_grid.is_valid():
+            data = entry_grid.read(coerce=True)
+
     :param parent: the tk parent element of this frame
     :param num_of_columns: the number of columns contained of the grid
     :param headers: a list containing the names of the column headers
+    :param validators: a dict of validators keyed by column number
+    :param invalid_background: the background color of invalid cells
     """
     def __init__(self, parent,
                  num_of_columns: int, headers: list=None,
+                 validators: dict=None, invalid_background: str='#ffc0c0',
                  **options):
         super().__init__(parent, num_of_columns, headers, **options)
 
+        self._tab_entry = None
+        self._load_job = None
+        self._load_file = None
+
+        self.invalid_background = invalid_background
+        self._valid_background = None
+        self._validators = dict()
+        self._columns = dict()
+        self._dirty = set()
+        self._invalid = set()
+        self._validate_job = None
+
+        self._cell_tag = 'EntryGridCell{}'.format(id(self))
+        self.bind_class(self._cell_tag, '<KeyRelease>', self._cell_edited)
+
+        if validators:
+            for column, validator in validators.items():
+                self.set_validator(column, validator)
+
     def add_row(self, data: list=None):
         r"""
         Add a row of data to the current widget, add a <Tab> \
@@ -150,139 +675,739 @@ class EntryGrid(Grid):
             if len(self.headers) != len(data):
                 raise ValueError
 
-        offset = 0 if not self.headers else 1
+        self._append_row(data)
+        self._bind_tab()
+
+        e = self.rows[-1][0]
+        e.focus_set()
+
+        self._redraw()
+
+    def _append_row(self, data: list=None):
+        r"""
+        Create and grid the entries of a new row below the existing rows
+
+        :param data: a row of data
+        :return: None
+        """
+        offset = self._row_offset()
         row = list()
 
         if data:
             for i, element in enumerate(data):
                 contents = '' if element is None else str(element)
-                entry = tk.Entry(self)
+                entry = self._new_entry(i)
                 entry.insert(0, contents)
                 entry.grid(row=len(self.rows) + offset, column=i, sticky='E,W')
                 row.append(entry)
         else:
             for i in range(self.num_of_columns):
-                entry = tk.Entry(self)
+                entry = self._new_entry(i)
                 entry.grid(row=len(self.rows) + offset, column=i, sticky='E,W')
                 row.append(entry)
 
         self.rows.append(row)
 
-        # clear all bindings
-        for row in self.rows:
-            for widget in row:
-                widget.unbind('<Tab>')
+    def _new_entry(self, column: int):
+        r"""
+        Create an entry for ``column`` which takes part in validation
 
-        def add(e):
-            self.add_row()
+        :param column: the column of the entry
+        :return: the new entry
+        """
+        entry = tk.Entry(self)
+        entry.bindtags(entry.bindtags() + (self._cell_tag,))
+        self._columns[entry] = column
 
-        last_entry = self.rows[-1][-1]
-        last_entry.bind('<Tab>', add)
+        if column in self._validators:
+            self._mark_dirty(entry)
 
-        e = self.rows[-1][0]
-        e.focus_set()
+        return entry
 
-        self._redraw()
+    def _new_cell(self, column: int):
+        # the window only displays the source, so it cannot be typed in
+        entry = self._new_entry(column)
+        entry.config(state='readonly',
+                     readonlybackground=entry.cget('background'))
+        return entry
 
-    def _read_as_dict(self):
+    def _set_cell_text(self, widget, text: str):
+        widget.config(state=tk.NORMAL)
+        widget.delete(0, tk.END)
+        widget.insert(0, text)
+        widget.config(state='readonly')
+
+        if self._columns.get(widget) in self._validators:
+            self._mark_dirty(widget)
+
+    def remove_row(self, row_number: int=-1):
         r"""
-        Read the data contained in all entries as a list of
-        dictionaries with the headers as the dictionary keys
+        Removes a specified row of data
 
-        :return: list of dicts containing all tabular data
+        :param row_number: the row to remove (defaults to the last row)
+        :return: None
         """
-        data = list()
-        for row in self.rows:
-            row_data = OrderedDict()
-            for i, header in enumerate(self.headers):
-                row_data[header.cget('text')] = row[i].get()
+        if len(self.rows) == 0:
+            return
 
-            data.append(row_data)
+        for entry in self.rows[row_number]:
+            self._columns.pop(entry, None)
+            self._dirty.discard(entry)
+            self._invalid.discard(entry)
 
-        return data
+        super().remove_row(row_number)
 
-    def _read_as_table(self):
+    def set_validator(self, column: int, validator, allow_empty: bool=True):
         r"""
-        Read the data contained in all entries as a list of
-        lists containing all of the data
-
-        :return: list of dicts containing all tabular data
+        Validate (and coerce) the cells of ``column``.  All existing \
+        cells of the column are validated in a single pass.
+
+        :param column: the column number
+        :param validator: ``int``, ``float``, a regular expression or a \
+        callable converting the cell text; None removes the validator
+        :param allow_empty: True if empty cells are valid (and read as \
+        None when coerced)
+        :return: None
         """
-        rows = list()
+        entries = [row[column] for row in self.rows]
 
-        for row in self.rows:
-            rows.append([row[i].get() for i in range(self.num_of_columns)])
+        if validator is None:
+            self._validators.pop(column, None)
+            for entry in entries:
+                self._dirty.discard(entry)
+                self._set_invalid(entry, False)
+            return
 
-        return rows
+        if isinstance(validator, (str, type(re.compile('')))):
+            validator = _regex_validator(validator)
 
-    def read(self, as_dicts=True):
+        self._validators[column] = (validator, allow_empty)
+        self._validate_column(column, entries)
+
+    def is_valid(self):
         r"""
-        Read the data from the entry fields
+        Check that every validated cell holds a valid value.  Only \
+        cells edited since the last check are re-validated.
 
-        :param as_dicts: True if list of dicts required, else False
-        :return: entries as a dict or table
+        :return: True if no cell is invalid
         """
-        if as_dicts:
-            return self._read_as_dict()
-        else:
-            return self._read_as_table()
+        if self._dirty:
+            self._validate_dirty()
 
+        return not self._invalid
 
-class ButtonGrid(Grid):
-    r"""
-    A grid of buttons.
+    def invalid_cells(self):
+        r"""
+        The cells which currently hold an invalid value
 
-    :param parent: the tk parent element of this frame
-    :param num_of_columns: the number of columns contained of the grid
-    :param headers: a list containing the names of the column headers
-    """
-    def __init__(self, parent, num_of_columns: int, headers: list=None,
-                 **options):
-        super().__init__(parent, num_of_columns, headers, **options)
+        :return: a list of (row, column) tuples
+        """
+        self.is_valid()
 
-    def add_row(self, data: list = None):
+        return [(i, j) for i, row in enumerate(self.rows)
+                for j, entry in enumerate(row) if entry in self._invalid]
+
+    def _cell_edited(self, event):
+        if self._columns.get(event.widget) in self._validators:
+            self._mark_dirty(event.widget)
+
+    def _mark_dirty(self, entry):
+        self._dirty.add(entry)
+
+        if self._validate_job is None:
+            self._validate_job = self.after_idle(self._validate_dirty)
+
+    def _validate_dirty(self):
         r"""
-        Add a row of data to the current widget
-        :param data: a row of data
+        Validate the dirty cells, one column at a time
+
         :return: None
         """
+        if self._validate_job is not None:
+            self.after_cancel(self._validate_job)
+            self._validate_job = None
 
-        # validation
-        if self.headers and data:
-            if len(self.headers) != len(data):
-                raise ValueError
+        by_column = dict()
+        for entry in self._dirty:
+            by_column.setdefault(self._columns[entry], []).append(entry)
 
-        offset = 0 if not self.headers else 1
-        row = list()
+        self._dirty.clear()
 
-        for i, e in enumerate(data):
-            button = tk.Button(self, text=str(e[0]), relief=tk.RAISED,
-                               command=e[1], padx=self.padding,
-                               pady=self.padding)
+        for column, entries in by_column.items():
+            self._validate_column(column, entries)
 
-            button.grid(row=len(self.rows) + offset, column=i, sticky='E,W')
-            row.append(button)
+    def _validate_column(self, column: int, entries: list):
+        validator, allow_empty = self._validators[column]
 
-        self.rows.append(row)
+        for entry in entries:
+            self._dirty.discard(entry)
+            text = entry.get()
 
+            if allow_empty and not text:
+                valid = True
+            else:
+                try:
+                    validator(text)
+                    valid = True
+                except (ValueError, TypeError):
+                    valid = False
+
+            self._set_invalid(entry, not valid)
+
+    def _set_invalid(self, entry, invalid: bool):
+        if invalid and entry not in self._invalid:
+            if self._valid_background is None:
+                self._valid_background = entry.cget('background')
+
+            self._invalid.add(entry)
+            entry.config(background=self.invalid_background)
+        elif not invalid and entry in self._invalid:
+            self._invalid.discard(entry)
+            entry.config(background=self._valid_background)
+
+    def _cell_value(self, entry, column: int, coerce: bool):
+        r"""
+        The value of a cell, converted by the column validator if \
+        ``coerce`` is True; invalid cells are then read as None.
+        """
+        text = entry.get()
+        if not coerce or column not in self._validators:
+            return text
 
-class KeyValueEntry(tk.Frame):
-    r"""
-    Creates a key-value input/output frame.
+        validator, allow_empty = self._validators[column]
+        if allow_empty and not text:
+            return None
 
-    :param parent: the parent frame
+        try:
+            return validator(text)
+        except (ValueError, TypeError):
+            return None
+
+    def _bind_tab(self):
+        r"""
+        Move the <Tab> binding which adds a new row to the last entry
+
+        :return: None
+        """
+        if self._tab_entry is not None and self._tab_entry.winfo_exists():
+            self._tab_entry.unbind('<Tab>')
+
+        self._tab_entry = None
+        if not self.rows:
+            return
+
+        def add(e):
+            self.add_row()
+
+        self._tab_entry = self.rows[-1][-1]
+        self._tab_entry.bind('<Tab>', add)
+
+    def load_csv(self, path: str, chunk_rows: int=200,
+                 on_progress: callable=None, on_complete: callable=None,
+                 skip_header: bool=False, encoding: str=None,
+                 **fmtparams):
+        r"""
+        Append the rows of a CSV file to the grid without blocking the \
+        GUI.  The file is streamed and rows are inserted ``chunk_rows`` \
+        at a time, with the event loop serviced between chunks.  Rows \
+        are padded or truncated to the number of columns of the grid. \
+        Any load still in progress is cancelled first.::
+
+            entry_grid.load_csv('log.csv', chunk_rows=500,
+                                on_progress=lambda n: print(n, 'rows'))
+
+        :param path: the path to the CSV file
+        :param chunk_rows: the number of rows inserted per chunk
+        :param on_progress: called with the number of rows loaded so \
+        far after each chunk
+        :param on_complete: called with the total number of rows loaded \
+        once the whole file has been read
+        :param skip_header: True if the first line of the file should \
+        be skipped
+        :param encoding: the encoding of the file
+        :param fmtparams: formatting parameters passed to ``csv.reader``
+        :return: None
+        """
+        if chunk_rows < 1:
+            raise ValueError('chunk_rows must be at least 1')
+
+        self.cancel_load()
+
+        f = open(path, newline='', encoding=encoding)
+        reader = csv.reader(f, **fmtparams)
+        if skip_header:
+            next(reader, None)
+
+        self._load_file = f
+        loaded = [0]
+
+        def load_chunk():
+            self._load_job = None
+            try:
+                count = 0
+                for data in itertools.islice(reader, chunk_rows):
+                    self._append_row(self._fit_row(data))
+                    count += 1
+            except Exception:
+                self.cancel_load()
+                raise
+
+            loaded[0] += count
+            self._bind_tab()
+
+            if count < chunk_rows:
+                self.cancel_load()
+                if on_complete is not None:
+                    on_complete(loaded[0])
+                return
+
+            if on_progress is not None:
+                on_progress(loaded[0])
+
+            self._load_job = self.after(1, load_chunk)
+
+        self._load_job = self.after(1, load_chunk)
+
+    def cancel_load(self):
+        r"""
+        Stop a :meth:`load_csv` in progress; rows which have already \
+        been inserted are kept.
+
+        :return: None
+        """
+        if self._load_job is not None:
+            self.after_cancel(self._load_job)
+            self._load_job = None
+
+        if self._load_file is not None:
+            self._load_file.close()
+            self._load_file = None
+
+    def destroy(self):
+        self.cancel_load()
+        super().destroy()
+
+    @property
+    def loading(self):
+        r"""
+        True while a :meth:`load_csv` is in progress
+        """
+        return self._load_file is not None
+
+    def dump_csv(self, path: str, include_headers: bool=True,
+                 encoding: str=None, **fmtparams):
+        r"""
+        Write the contents of the grid to a CSV file, one row at a time.
+
+        :param path: the path to the CSV file
+        :param include_headers: True if the header texts should be \
+        written as the first line
+        :param encoding: the encoding of the file
+        :param fmtparams: formatting parameters passed to ``csv.writer``
+        :return: None
+        """
+        with open(path, 'w', newline='', encoding=encoding) as f:
+            writer = csv.writer(f, **fmtparams)
+
+            if include_headers and self.headers:
+                writer.writerow(header.cget('text')
+                                for header in self.headers)
+
+            for row in self.rows:
+                writer.writerow(entry.get() for entry in row)
+
+    def _fit_row(self, data: list):
+        r"""
+        Pad or truncate a row of data to the number of columns
+
+        :param data: a row of data
+        :return: a list with exactly ``num_of_columns`` elements
+        """
+        data = data[:self.num_of_columns]
+        return data + [''] * (self.num_of_columns - len(data))
+
+    def _read_as_dict(self, coerce: bool=False):
+        r"""
+        Read the data contained in all entries as a list of
+        dictionaries with the headers as the dictionary keys
+
+        :param coerce: True to convert values using the column validators
+        :return: list of dicts containing all tabular data
+        """
+        data = list()
+        for row in self.rows:
+            row_data = OrderedDict()
+            for i, header in enumerate(self.headers):
+                row_data[header.cget('text')] = \
+                    self._cell_value(row[i], i, coerce)
+
+            data.append(row_data)
+
+        return data
+
+    def _read_as_table(self, coerce: bool=False):
+        r"""
+        Read the data contained in all entries as a list of
+        lists containing all of the data
+
+        :param coerce: True to convert values using the column validators
+        :return: list of dicts containing all tabular data
+        """
+        rows = list()
+
+        for row in self.rows:
+            rows.append([self._cell_value(row[i], i, coerce)
+                         for i in range(self.num_of_columns)])
+
+        return rows
+
+    def read(self, as_dicts=True, coerce=False):
+        r"""
+        Read the data from the entry fields
+
+        :param as_dicts: True if list of dicts required, else False
+        :param coerce: True to convert values using the column \
+        validators; invalid cells are read as None
+        :return: entries as a dict or table
+        """
+        if as_dicts:
+            return self._read_as_dict(coerce)
+        else:
+            return self._read_as_table(coerce)
+
+
+class ButtonGrid(Grid):
+    r"""
+    A grid of buttons.
+
+    Each element of a row is either the button text or a tuple of \
+    ``(text, command)``.  Buttons without their own command call the \
+    grid ``command`` with their row and column.
+
+    In ``compact`` mode the buttons are drawn on a single canvas rather \
+    than created as widgets, and every click is handled by one handler \
+    which works out the cell from the click coordinates.  This suits \
+    large keypads and matrices.::
+
+        def clicked(row, column):
+            print(row, column)
+
+        matrix = ButtonGrid(root, 32, compact=True, command=clicked)
+        for r in range(32):
+            matrix.add_row(['{},{}'.format(r, c) for c in range(32)])
+
+        matrix.configure_cells({(0, 0): {'text': 'on'},
+                                (0, 1): {'state': 'disabled'}})
+
+    :param parent: the tk parent element of this frame
+    :param num_of_columns: the number of columns contained of the grid
+    :param headers: a list containing the names of the column headers
+    :param command: callable receiving ``(row, column)`` of a clicked \
+    button which has no command of its own
+    :param compact: True to draw the buttons on a single canvas
+    :param cell_width: the width of a compact cell in pixels
+    :param cell_height: the height of a compact cell in pixels
+    """
+    button_color = '#d9d9d9'
+    active_color = '#ececec'
+    text_color = 'black'
+    disabled_text_color = '#a3a3a3'
+
+    def __init__(self, parent, num_of_columns: int, headers: list=None,
+                 command: callable=None, compact: bool=False,
+                 cell_width: int=60, cell_height: int=26,
+                 **options):
+        if compact and headers and len(headers) != num_of_columns:
+            raise ValueError
+
+        super().__init__(parent, num_of_columns,
+                         None if compact else headers, **options)
+
+        self.command = command
+        self.compact = compact
+        self._canvas = None
+
+        if compact:
+            self._cell_width = cell_width
+            self._cell_height = cell_height
+            self._header_height = cell_height if headers else 0
+            self._pressed_cell = None
+
+            self._canvas = tk.Canvas(self, highlightthickness=0,
+                                     width=num_of_columns * cell_width,
+                                     height=self._header_height)
+            self._canvas.grid(row=0, column=0)
+            self._canvas.bind('<ButtonPress-1>', self._pressed)
+            self._canvas.bind('<ButtonRelease-1>', self._released)
+
+            for i, header in enumerate(headers or []):
+                self._canvas.create_text(
+                    (i + 0.5) * cell_width, cell_height / 2,
+                    text=str(header))
+
+    def add_row(self, data: list = None):
+        r"""
+        Add a row of data to the current widget
+        :param data: a row of data; None adds a row of blank buttons
+        :return: None
+        """
+
+        # validation
+        if self.headers and data:
+            if len(self.headers) != len(data):
+                raise ValueError
+
+        if data is None:
+            data = [''] * self.num_of_columns
+
+        if self.compact:
+            if len(data) > self.num_of_columns:
+                raise ValueError
+
+            self._add_cells(data)
+            return
+
+        offset = self._row_offset()
+        row = list()
+
+        for i, e in enumerate(data):
+            text, command = _button_spec(e)
+            button = tk.Button(self, text=str(text), relief=tk.RAISED,
+                               padx=self.padding, pady=self.padding)
+
+            if command is None and self.command is not None:
+                def command(button=button):
+                    self._dispatch(button)
+
+            button.config(command=command)
+            button.grid(row=len(self.rows) + offset, column=i, sticky='E,W')
+            row.append(button)
+
+        self.rows.append(row)
+
+    def remove_row(self, row_number: int=-1):
+        r"""
+        Removes a specified row of data
+
+        :param row_number: the row to remove (defaults to the last row)
+        :return: None
+        """
+        if not self.compact:
+            super().remove_row(row_number)
+            return
+
+        if len(self.rows) == 0:
+            return
+
+        row_id = range(len(self.rows))[row_number]
+        for cell in self.rows.pop(row_id):
+            self._canvas.delete(cell['rect'], cell['text'])
+
+        # move the cells below the removed row up by one row
+        for row in self.rows[row_id:]:
+            for cell in row:
+                self._canvas.move(cell['rect'], 0, -self._cell_height)
+                self._canvas.move(cell['text'], 0, -self._cell_height)
+
+        self._resize_canvas()
+
+    def clear(self):
+        r"""
+        Removes all elements of the grid
+
+        :return: None
+        """
+        if not self.compact:
+            super().clear()
+            return
+
+        for row in self.rows:
+            for cell in row:
+                self._canvas.delete(cell['rect'], cell['text'])
+
+        self.rows = list()
+        self._pressed_cell = None
+        self._resize_canvas()
+
+    def configure_cells(self, updates: dict):
+        r"""
+        Change the text, state or command of many buttons at once.::
+
+            button_grid.configure_cells({
+                (0, 0): {'text': 'A', 'state': 'normal'},
+                (3, 2): {'state': 'disabled'}
+            })
+
+        :param updates: a dict keyed by ``(row, column)`` of dicts \
+        containing any of ``'text'``, ``'state'`` and ``'command'``
+        :return: None
+        """
+        for (row, column), changes in updates.items():
+            if not self.compact:
+                self.rows[row][column].config(**changes)
+                continue
+
+            cell = self.rows[row][column]
+            if 'command' in changes:
+                cell['command'] = changes['command']
+
+            if 'text' in changes and str(changes['text']) != cell['label']:
+                cell['label'] = str(changes['text'])
+                self._canvas.itemconfigure(cell['text'],
+                                           text=cell['label'])
+
+            if 'state' in changes and changes['state'] != cell['state']:
+                cell['state'] = changes['state']
+                self._canvas.itemconfigure(
+                    cell['text'], fill=self._text_color(cell['state']))
+
+    def _add_cells(self, data: list):
+        r"""
+        Draw a new row of compact cells below the existing rows
+
+        :param data: a row of data
+        :return: None
+        """
+        w, h = self._cell_width, self._cell_height
+        y = self._header_height + len(self.rows) * h
+        row = list()
+
+        for i, e in enumerate(data):
+            text, command = _button_spec(e)
+            x = i * w
+            rect = self._canvas.create_rectangle(
+                x + 1, y + 1, x + w - 1, y + h - 1,
+                fill=self.button_color, outline='grey60')
+            label = self._canvas.create_text(
+                x + w / 2, y + h / 2, text=str(text), fill=self.text_color)
+            row.append({'rect': rect, 'text': label, 'label': str(text),
+                        'command': command, 'state': tk.NORMAL})
+
+        self.rows.append(row)
+        self._resize_canvas()
+
+    def _resize_canvas(self):
+        self._canvas.config(
+            height=self._header_height + len(self.rows) * self._cell_height)
+
+    def _text_color(self, state: str):
+        if state == tk.DISABLED:
+            return self.disabled_text_color
+        return self.text_color
+
+    def _cell_at(self, x: int, y: int):
+        r"""
+        The compact cell under canvas coordinates ``(x, y)``
+
+        :return: a tuple of (row, column) or None
+        """
+        x, y = self._canvas.canvasx(x), self._canvas.canvasy(y)
+        if y < self._header_height:
+            return None
+
+        row = int((y - self._header_height) // self._cell_height)
+        column = int(x // self._cell_width)
+        if row >= len(self.rows) or not 0 <= column < len(self.rows[row]):
+            return None
+
+        return row, column
+
+    def _pressed(self, event):
+        position = self._cell_at(event.x, event.y)
+        if position is None:
+            return
+
+        cell = self.rows[position[0]][position[1]]
+        if cell['state'] == tk.DISABLED:
+            return
+
+        self._pressed_cell = position
+        self._canvas.itemconfigure(cell['rect'], fill=self.active_color)
+
+    def _released(self, event):
+        position, self._pressed_cell = self._pressed_cell, None
+        if position is None:
+            return
+
+        row, column = position
+        if row >= len(self.rows) or column >= len(self.rows[row]):
+            return
+
+        cell = self.rows[row][column]
+        self._canvas.itemconfigure(cell['rect'], fill=self.button_color)
+
+        if self._cell_at(event.x, event.y) != position:
+            return
+
+        if cell['command'] is not None:
+            cell['command']()
+        elif self.command is not None:
+            self.command(row, column)
+
+    def _dispatch(self, button):
+        r"""
+        Call the grid command with the position of a button widget
+
+        :param button: the button which was clicked
+        :return: None
+        """
+        for row, buttons in enumerate(self.rows):
+            if button in buttons:
+                self.command(row, buttons.index(button))
+                return
+
+
+def _button_spec(element):
+    r"""
+    Split a ButtonGrid element into its text and command
+
+    :param element: either the text or a tuple of (text, command)
+    :return: a tuple of (text, command)
+    """
+    if isinstance(element, (tuple, list)):
+        return element[0], element[1]
+
+    return element, None
+
+
+class KeyValueEntry(tk.Frame):
+    r"""
+    Creates a key-value input/output frame.  Values may be converted by \
+    a callable per key, such as ``int`` or ``float``, when retrieved \
+    with ``get(typed=True)``.
+
+    The keys edited by the user are recorded until ``clear_changes()`` \
+    and returned by ``get_changes()``.  ``on_edit_callback`` receives \
+    the set of keys edited since it was last called, once the user has \
+    stopped typing for ``debounce_ms``.::
+
+        def save(keys):
+            plc.write({key: kve.get()[key] for key in keys})
+
+        kve = KeyValueEntry(root, ['speed', 'torque'],
+                            converters=[int, float],
+                            on_edit_callback=save)
+
+    :param parent: the parent frame
     :param keys: the keys represented
     :param defaults: default values for each key
     :param unit_labels: unit labels for each key (to the right of the value)
     :param enables: True/False for each key
     :param title: The title of the block
     :param on_change_callback: a function callback when any element is changed
+    :param converters: a callable converting the text of each key, or None
+    :param on_edit_callback: a function callback receiving the set of \
+    keys edited by the user, once they stop typing (unlike \
+    ``on_change_callback``, which is called on every change)
+    :param debounce_ms: the quiet time before ``on_edit_callback`` is \
+    called
     :param options: frame tk options
     """
     def __init__(self, parent, keys: list, defaults: list=None,
                  unit_labels: list=None, enables: list=None,
                  title: str=None, on_change_callback: callable=None,
-                 **options):
+                 converters: list=None, on_edit_callback: callable=None,
+                 debounce_ms: int=250, **options):
         tk.Frame.__init__(self, parent,
                           borderwidth=2,
                           padx=5, pady=5,
@@ -301,14 +1426,41 @@ class KeyValueEntry(tk.Frame):
             if len(keys) != len(enables):
                 raise ValueError('enables length does not '
                                  'match keys length')
+        if converters:
+            if len(keys) != len(converters):
+                raise ValueError('converters length does not '
+                                 'match keys length')
 
         self.keys = []
         self.values = []
         self.defaults = []
         self.unit_labels = []
         self.enables = []
+        self.converters = []
         self.callback = on_change_callback
 
+        # the key of each row, the row of each key and the current text \
+        # of each entry, kept up to date by a trace on its variable
+        self._key_texts = []
+        self._rows = dict()
+        self._vars = []
+        self._texts = []
+
+        # keys edited by the user, rather than written by load() or reset()
+        self.edit_callback = on_edit_callback
+        self.debounce_ms = debounce_ms
+        self._writing = False
+        self._dirty = set()
+        self._pending = set()
+        self._pending_id = None
+
+        # the entry of each row, and the polled source of bind_source()
+        self._entry_rows = dict()
+        self._source = None
+        self._source_id = None
+        self._source_results = None
+        self._fetching = False
+
         if title is not None:
             self.title = tk.Label(self, text=title)
             self.title.grid(row=0, column=0, columnspan=3)
@@ -320,202 +1472,1480 @@ class KeyValueEntry(tk.Frame):
                 key=keys[i],
                 default=defaults[i] if defaults else None,
                 unit_label=unit_labels[i] if unit_labels else None,
-                enable=enables[i] if enables else None
+                enable=enables[i] if enables else None,
+                converter=converters[i] if converters else None
             )
 
-    def add_row(self, key: str, default: str=None,
-                unit_label: str=None, enable: bool=None):
-        """
-        Add a single row and re-draw as necessary
+    def add_row(self, key: str, default: str=None,
+                unit_label: str=None, enable: bool=None,
+                converter: callable=None):
+        """
+        Add a single row below the existing rows
+
+        :param key: the name and dict accessor
+        :param default: the default value
+        :param unit_label: the label that should be \
+        applied at the right of the entry
+        :param enable: the 'enabled' state (defaults to True)
+        :param converter: a callable converting the text of the entry, \
+        used by ``get(typed=True)``
+        :return:
+        """
+        self.keys.append(tk.Label(self, text=key))
+
+        self.defaults.append(default)
+        self.unit_labels.append(
+            tk.Label(self, text=unit_label if unit_label else '')
+        )
+        self.enables.append(enable)
+        self.converters.append(converter)
+
+        index = len(self._key_texts)
+        self._key_texts.append(key)
+        self._rows[key] = index
+        self._texts.append('')
+
+        var = tk.StringVar(self)
+        var.trace('w', lambda *args: self._var_written(index))
+        self._vars.append(var)
+
+        entry = tk.Entry(self, textvariable=var)
+        self.values.append(entry)
+        self._entry_rows[entry] = index
+
+        # only the new row is laid out, below the existing rows
+        row = len(self.keys) - 1
+        if self.title is not None:
+            row += 1
+
+        self.keys[-1].grid(row=row, column=0, sticky='e')
+        entry.grid(row=row, column=1)
+        self.unit_labels[-1].grid(row=row, column=3, sticky='w')
+
+        if default:
+            self._write(index, default)
+
+        if enable is False:
+            entry.config(state=tk.DISABLED)
+
+        if self.callback is not None:
+            entry.bind('<Return>', self._entry_changed)
+            entry.bind('<Tab>', self._entry_changed)
+
+    def _var_written(self, index: int):
+        self._texts[index] = self._vars[index].get()
+
+        if not self._writing:
+            self._edited(index)
+
+    def _edited(self, index: int):
+        r"""
+        Record that the user has edited the text of a key
+        """
+        key = self._key_texts[index]
+        self._dirty.add(key)
+
+        if self.edit_callback is not None:
+            self._pending.add(key)
+            if self._pending_id is not None:
+                self.after_cancel(self._pending_id)
+            self._pending_id = self.after(self.debounce_ms,
+                                          self._changes_settled)
+
+    def _changes_settled(self):
+        self._pending_id = None
+        keys, self._pending = self._pending, set()
+        self.edit_callback(keys)
+
+    def _write(self, index: int, text: str):
+        r"""
+        Set the text of an entry without recording it as an edit
+        """
+        self._writing = True
+        try:
+            self._vars[index].set(text)
+        finally:
+            self._writing = False
+
+    def _entry_changed(self, event):
+        self.callback()
+
+    def set_converter(self, key: str, converter: callable):
+        """
+        Set the callable converting the text of a key for \
+        ``get(typed=True)``
+
+        :param key: the key
+        :param converter: a callable such as ``int`` or ``float``; None \
+        to return the text
+        :return: None
+        """
+        self.converters[self._rows[key]] = converter
+
+    def reset(self):
+        """
+        Clears all entries.
+
+        :return: None
+        """
+        for i, var in enumerate(self._vars):
+            default = self.defaults[i]
+            text = '' if default is None else str(default)
+
+            if text != self._texts[i]:
+                self._write(i, text)
+
+    def change_enables(self, enables_list: list):
+        """
+        Enable/disable inputs.
+
+        :param enables_list: list containing enables for each key
+        :return: None
+        """
+        for i, entry in enumerate(self.values):
+            if enables_list[i]:
+                entry.config(state=tk.NORMAL)
+            else:
+                entry.config(state=tk.DISABLED)
+
+    def load(self, data: dict):
+        """
+        Load values into the key/values via dict.  Only the entries whose \
+        text changes are written to, so reloading mostly unchanged data \
+        is cheap.
+
+        :param data: dict containing the key/values that should be inserted
+        :return: None
+        """
+        for key, value in data.items():
+            i = self._rows.get(key)
+            if i is None:
+                continue
+
+            text = str(value)
+            if text != self._texts[i]:
+                # the variable updates disabled entries too
+                self._write(i, text)
+
+    def get(self, typed: bool=False):
+        """
+        Retrieve the GUI elements for program use.
+
+        :param typed: True to convert the values of keys which have a \
+        converter; empty entries then become None
+        :return: a dictionary containing all \
+        of the data from the key/value entries
+        """
+        data = dict(zip(self._key_texts, self._texts))
+
+        if typed:
+            for key, converter in zip(self._key_texts, self.converters):
+                if converter is not None:
+                    text = data[key]
+                    data[key] = converter(text) if text.strip() else None
+
+        return data
+
+    def get_changes(self, typed: bool=False):
+        """
+        Retrieve the values of the keys edited by the user since the \
+        last ``clear_changes()``
+
+        :param typed: True to convert the values of keys which have a \
+        converter
+        :return: a dictionary containing the edited key/values
+        """
+        data = self.get(typed=typed)
+        return {key: data[key] for key in self._dirty}
+
+    def clear_changes(self):
+        """
+        Forget the keys edited by the user, such as once they are saved
+
+        :return: None
+        """
+        self._dirty.clear()
+
+    def bind_source(self, source, interval_ms: int=200,
+                    threaded: bool=False):
+        """
+        Display the values of a polled source, such as live telemetry.  \
+        The source is read every ``interval_ms`` by a single timer and \
+        only the values which changed are written; the value being \
+        edited by the user is left alone.::
+
+            kve.bind_source(plc.read_parameters, interval_ms=200,
+                            threaded=True)
+
+        :param source: a mapping of keys to values, or a callable \
+        returning one
+        :param interval_ms: the time between reads of the source
+        :param threaded: True to call the source in a background thread, \
+        for sources which block
+        :return: None
+        """
+        self.unbind_source()
+
+        self._source = source
+        self._source_interval = interval_ms
+        self._source_threaded = threaded
+        self._source_results = queue.Queue()
+        self._fetching = False
+
+        self._source_id = self.after_idle(self._poll_source)
+
+    def unbind_source(self):
+        """
+        Stop displaying the values of the source given to \
+        :meth:`bind_source`
+
+        :return: None
+        """
+        if self._source_id is not None:
+            self.after_cancel(self._source_id)
+
+        # a read still running in a thread reports to the old queue
+        self._source = None
+        self._source_id = None
+        self._source_results = None
+        self._fetching = False
+
+    @staticmethod
+    def _read_source(source):
+        return dict(source() if callable(source) else source)
+
+    @staticmethod
+    def _read_source_in_thread(source, results):
+        try:
+            results.put(KeyValueEntry._read_source(source))
+        except Exception as e:
+            results.put(e)
+
+    def _poll_source(self):
+        r"""
+        Read the source, or collect the read of the background thread \
+        and start the next one, then write the values which changed
+        """
+        # the next poll is scheduled first, so that an error reading the
+        # source is reported without ending the polling
+        self._source_id = self.after(self._source_interval,
+                                     self._poll_source)
+        data = None
+
+        if self._source_threaded:
+            try:
+                data = self._source_results.get_nowait()
+            except queue.Empty:
+                pass
+            else:
+                self._fetching = False
+
+            if not self._fetching:
+                self._fetching = True
+                threading.Thread(target=self._read_source_in_thread,
+                                 args=(self._source, self._source_results),
+                                 daemon=True).start()
+        else:
+            data = self._read_source(self._source)
+
+        if isinstance(data, Exception):
+            raise data
+
+        if data:
+            index = self._focused_index()
+            if index is not None:
+                data.pop(self._key_texts[index], None)
+
+            self.load(data)
+
+    def _focused_index(self):
+        r"""
+        The row of the entry with the keyboard focus, or None
+        """
+        try:
+            widget = self.focus_get()
+        except KeyError:
+            return None
+
+        return self._entry_rows.get(widget)
+
+    def destroy(self):
+        if self._pending_id is not None:
+            self.after_cancel(self._pending_id)
+            self._pending_id = None
+
+        self.unbind_source()
+        super().destroy()
+
+
+class ScrollableKeyValueEntry(KeyValueEntry):
+    r"""
+    A scrollable :class:`KeyValueEntry` for thousands of keys.  The keys, \
+    values and unit labels are kept in Python and widgets are created \
+    only for ``visible_rows`` rows, which are re-used to display other \
+    keys as the list is scrolled.  The optional filter box narrows the \
+    keys to those containing its text.  The ``keys``, ``values`` and \
+    ``unit_labels`` widget lists of ``KeyValueEntry`` are not populated.::
+
+        kve = ScrollableKeyValueEntry(root, sorted(parameters),
+                                      visible_rows=30)
+        kve.load(parameters)
+
+    :param parent: the parent frame
+    :param keys: the keys represented
+    :param visible_rows: the number of rows displayed
+    :param filter_box: True to display a box filtering the keys
+    :param kwargs: the other parameters of :class:`KeyValueEntry`
+    """
+    def __init__(self, parent, keys: list, defaults: list=None,
+                 unit_labels: list=None, enables: list=None,
+                 title: str=None, on_change_callback: callable=None,
+                 converters: list=None, on_edit_callback: callable=None,
+                 debounce_ms: int=250, visible_rows: int=20,
+                 filter_box: bool=True, **options):
+        # the model, filled by add_row() while the base class is built
+        self._units = []
+        self._lower = []
+        self._order = []
+        self._filter = ''
+        self._slots = []
+        self.first_row = 0
+
+        super().__init__(parent, keys, defaults=defaults,
+                         unit_labels=unit_labels, enables=enables,
+                         title=title, on_change_callback=on_change_callback,
+                         converters=converters,
+                         on_edit_callback=on_edit_callback,
+                         debounce_ms=debounce_ms, **options)
+
+        offset = 1 if self.title is not None else 0
+
+        if filter_box:
+            self._filter_var = tk.StringVar(self)
+            self._filter_var.trace(
+                'w', lambda *args: self.filter_text(self._filter_var.get()))
+            self.filter_entry = tk.Entry(self, textvariable=self._filter_var)
+            self.filter_entry.grid(row=offset, column=0, columnspan=4,
+                                   sticky='EW')
+            offset += 1
+        else:
+            self.filter_entry = None
+
+        tag = 'KeyValueWindow{}'.format(id(self))
+        self.bind_class(tag, '<MouseWheel>', self._mouse_wheel)
+        self.bind_class(tag, '<Button-4>', lambda e: self.scroll(-3))
+        self.bind_class(tag, '<Button-5>', lambda e: self.scroll(3))
+
+        # the model index and state shown by each row of widgets
+        self._slot_rows = []
+        self._slot_states = []
+        self._slot_of = dict()
+
+        for k in range(visible_rows):
+            label = tk.Label(self)
+            var = tk.StringVar(self)
+            var.trace('w', lambda *args, k=k: self._slot_written(k))
+            entry = tk.Entry(self, textvariable=var)
+            unit = tk.Label(self)
+
+            label.grid(row=offset + k, column=0, sticky='e')
+            entry.grid(row=offset + k, column=1)
+            unit.grid(row=offset + k, column=3, sticky='w')
+
+            if self.callback is not None:
+                entry.bind('<Return>', self._entry_changed)
+                entry.bind('<Tab>', self._entry_changed)
+
+            for widget in (label, entry, unit):
+                widget.bindtags(widget.bindtags() + (tag,))
+
+            self._slots.append((label, entry, var, unit))
+            self._slot_rows.append(None)
+            self._slot_states.append(tk.NORMAL)
+
+        self._scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL,
+                                       command=self._scrollbar_moved)
+        self._scrollbar.grid(row=offset, column=4,
+                             rowspan=max(visible_rows, 1), sticky='N,S')
+
+        self._show()
+
+    def add_row(self, key: str, default: str=None,
+                unit_label: str=None, enable: bool=None,
+                converter: callable=None):
+        """
+        Add a key after the existing keys
+
+        :param key: the name and dict accessor
+        :param default: the default value
+        :param unit_label: the label that should be \
+        applied at the right of the entry
+        :param enable: the 'enabled' state (defaults to True)
+        :param converter: a callable converting the text of the entry, \
+        used by ``get(typed=True)``
+        :return: None
+        """
+        index = len(self._key_texts)
+        self._key_texts.append(key)
+        self._rows[key] = index
+        self._texts.append(str(default) if default else '')
+        self._lower.append(key.lower())
+        self._units.append(unit_label if unit_label else '')
+
+        self.defaults.append(default)
+        self.enables.append(enable)
+        self.converters.append(converter)
+
+        if self._filter in self._lower[index]:
+            self._order.append(index)
+
+        if self._slots:
+            self._show()
+
+    def _focused_index(self):
+        try:
+            widget = self.focus_get()
+        except KeyError:
+            return None
+
+        for k, slot in enumerate(self._slots):
+            if slot[1] is widget:
+                return self._slot_rows[k]
+
+        return None
+
+    def _slot_written(self, k: int):
+        if self._writing:
+            return
+
+        index = self._slot_rows[k]
+        if index is not None:
+            self._texts[index] = self._slots[k][2].get()
+            self._edited(index)
+
+    def _write(self, index: int, text: str):
+        self._texts[index] = text
+
+        k = self._slot_of.get(index)
+        if k is not None:
+            self._writing = True
+            try:
+                self._slots[k][2].set(text)
+            finally:
+                self._writing = False
+
+    def reset(self):
+        """
+        Clears all entries.
+
+        :return: None
+        """
+        for i, default in enumerate(self.defaults):
+            text = '' if default is None else str(default)
+
+            if text != self._texts[i]:
+                self._write(i, text)
+
+    def change_enables(self, enables_list: list):
+        """
+        Enable/disable inputs.
+
+        :param enables_list: list containing enables for each key
+        :return: None
+        """
+        self.enables = [bool(enable) for enable in enables_list]
+        self._show()
+
+    def filter_text(self, text: str):
+        r"""
+        Display only the keys containing ``text`` (case insensitive).  \
+        Typing further characters narrows the keys already displayed \
+        rather than searching them all again.
+
+        :param text: the text to search for; '' displays all keys
+        :return: None
+        """
+        text = text.lower()
+
+        if self._filter and text.startswith(self._filter):
+            candidates = self._order
+        else:
+            candidates = range(len(self._key_texts))
+
+        self._filter = text
+        self._order = [i for i in candidates if text in self._lower[i]]
+        self.first_row = 0
+        self._show()
+
+    def scroll_to(self, first_row: int):
+        r"""
+        Display the keys starting at ``first_row`` of the filtered keys
+
+        :param first_row: the index of the first key to display
+        :return: None
+        """
+        self.first_row = first_row
+        self._show()
+
+    def scroll(self, rows: int):
+        r"""
+        Move the displayed keys
+
+        :param rows: the number of rows to move by (negative moves up)
+        :return: None
+        """
+        self.scroll_to(self.first_row + rows)
+
+    def _scrollbar_moved(self, action, amount, unit=None):
+        if action == tk.MOVETO:
+            self.scroll_to(int(float(amount) * len(self._order)))
+        elif unit == tk.PAGES:
+            self.scroll(int(amount) * len(self._slots))
+        else:
+            self.scroll(int(amount))
+
+    def _mouse_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+
+    def _show(self):
+        r"""
+        Display the filtered keys from ``first_row`` in the rows of \
+        widgets, changing only the rows which display another key or state
+        """
+        total = len(self._order)
+        visible = len(self._slots)
+        self.first_row = max(0, min(self.first_row, total - visible))
+
+        self._slot_of.clear()
+        self._writing = True
+        try:
+            for k, (label, entry, var, unit) in enumerate(self._slots):
+                position = self.first_row + k
+                index = self._order[position] if position < total else None
+
+                if index is not None:
+                    self._slot_of[index] = k
+                    state = tk.DISABLED if self.enables[index] is False \
+                        else tk.NORMAL
+                else:
+                    state = tk.DISABLED
+
+                # the variable updates disabled entries too
+                if index != self._slot_rows[k]:
+                    if index is None:
+                        label.config(text='')
+                        var.set('')
+                        unit.config(text='')
+                    else:
+                        label.config(text=self._key_texts[index])
+                        var.set(self._texts[index])
+                        unit.config(text=self._units[index])
+
+                    self._slot_rows[k] = index
+
+                if state != self._slot_states[k]:
+                    entry.config(state=state)
+                    self._slot_states[k] = state
+        finally:
+            self._writing = False
+
+        if total:
+            self._scrollbar.set(self.first_row / total,
+                                min(self.first_row + visible, total) / total)
+        else:
+            self._scrollbar.set(0, 1)
+
+
+def _column_letter(column: int):
+    r"""
+    The spreadsheet letters of a column, such as 'A' or 'AB'
+
+    :param column: the index of the column (starting at 0)
+    :return: the column letters
+    """
+    letters = ''
+    column += 1
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+
+    return letters
+
+
+def _to_number(value):
+    r"""
+    Convert a cell value to a float; empty cells become NaN
+
+    :param value: the cell value
+    :return: a float
+    """
+    if value is None or value == '':
+        return float('nan')
+
+    return float(value)
+
+
+def _tokens(text: str):
+    r"""
+    Split text into the lower-case words used to index and search cells
+
+    :param text: the text
+    :return: a list of words
+    """
+    return re.findall(r'\w+', text.lower())
+
+
+def _parse_cell_reference(text: str):
+    r"""
+    Convert a spreadsheet cell reference into zero-based indexes.  Both \
+    'A1' style references and plain row numbers are accepted.
+
+    :param text: the reference, such as 'C1200' or '1200'
+    :return: a tuple of (row, column); column is None for a row number
+    """
+    match = re.fullmatch(r'\s*([A-Za-z]*)\s*(\d+)\s*', text)
+    if match is None or int(match.group(2)) < 1:
+        raise ValueError('invalid cell reference {!r}'.format(text))
+
+    letters, digits = match.groups()
+
+    column = None
+    if letters:
+        column = 0
+        for letter in letters.upper():
+            column = column * 26 + ord(letter) - ord('A') + 1
+        column -= 1
+
+    return int(digits) - 1, column
+
+
+class SpreadSheetReader(tk.Frame):
+    r"""
+    Displays a page of a spreadsheet with buttons to navigate the sheet.
+
+    The file is read by a backend chosen from its extension: ``.xls`` \
+    with ``xlrd``, ``.xlsx`` with ``openpyxl`` (optional) and \
+    ``.csv``/``.tsv`` through a memory-mapped index of line offsets; \
+    see ``tk_tools.readers``.  The workbook is opened in a background \
+    thread, while the reader shows that it is loading, and is kept open \
+    while the reader moves around the sheet; it is only re-opened if the \
+    file changes on disk. \
+    Pages are decoded in blocks of ``rows_to_display`` by \
+    ``cols_do_display`` cells, and the blocks around the displayed page \
+    are decoded in the background into a bounded cache so that moving \
+    to a neighbouring page is immediate; a page which is not cached, \
+    such as one far into a large CSV file, is read in the background \
+    too while the header shows that the reader is busy.  Use \
+    :meth:`close` (or the reader as a context manager) to release the \
+    workbook.::
+
+        with SpreadSheetReader(root, 'data.xls') as reader:
+            reader.grid()
+            root.mainloop()
+
+    :param parent: the tk parent frame
+    :param path: the path to the spreadsheet
+    :param rows_to_display: the number of rows in a page
+    :param cols_do_display: the number of columns in a page
+    :param sheetname: the name of the sheet (defaults to the first sheet)
+    :param max_cached_blocks: the number of decoded blocks kept in memory
+    :param backend: a ``ReaderBackend`` subclass used to read the file; \
+    chosen from the file extension by default
+    :param cache_dir: a directory in which to keep converted copies of \
+    the sheets, so that re-opening the same file is fast; None disables \
+    the cache
+    :param cache_max_bytes: the maximum total size of ``cache_dir``
+    :param on_column_select: called with the index of a column when it \
+    is selected by clicking its header or one of its cells
+    :param options: frame tk options
+    """
+    header_text = 'Select the column you wish to import'
+    selected_background = '#cce4ff'
+
+    def __init__(self, parent, path, rows_to_display=20, cols_do_display=8,
+                 sheetname=None, max_cached_blocks=64, backend=None,
+                 cache_dir=None, cache_max_bytes=1 << 30,
+                 on_column_select=None, **options):
+        tk.Frame.__init__(self, parent, **options)
+
+        self._backend_class = backend if backend else backend_for(path)
+        if cache_dir is not None and self._backend_class.cacheable:
+            self._backend_class = functools.partial(
+                ColumnarCacheBackend, backend=self._backend_class,
+                directory=cache_dir, max_bytes=cache_max_bytes)
+
+        self._backend = None
+        self._backend_signature = None
+
+        # _lock guards the backend and _cache_lock the decoded blocks, so \
+        # cached pages are not held up by a block being read; when both \
+        # are needed, _lock is taken first
+        self._lock = threading.RLock()
+        self._cache_lock = threading.RLock()
+        self._blocks = OrderedDict()
+        self._blocks_epoch = 0
+        self._queued_blocks = dict()
+        self._generation = 0
+        self.max_cached_blocks = max_cached_blocks
+        self._loaded = False
+        self._load_result = queue.Queue()
+        self._jobs = queue.Queue()
+
+        # pages which are not cached are read by the worker thread
+        self._wanted_page = None
+        self._page_result = queue.Queue()
+        self._page_poll_id = None
+        self._header_before_reading = None
+
+        self.header = tk.Label(self, text='Loading {}...'.format(path))
+        self.header.grid(row=0, column=0, columnspan=4)
+
+        # the cells are created once and re-written as the page moves
+        self.entry_grid = EntryGrid(
+            self, num_of_columns=cols_do_display,
+            headers=[_column_letter(i) for i in range(cols_do_display)])
+        self.entry_grid.grid(row=1, column=0, columnspan=4, rowspan=4)
+        self.entry_grid.allocate_window(rows_to_display)
+
+        # clicking a header or a cell selects its column
+        self.selected_column = None
+        self.on_column_select = on_column_select
+        self._header_letters = [h.cget('text')
+                                for h in self.entry_grid.headers]
+        self._highlighted = None
+        self._cell_background = None
+        select_tag = 'SpreadSheetColumn{}'.format(id(self))
+        self.bind_class(select_tag, '<Button-1>', self._column_clicked)
+        for i, header in enumerate(self.entry_grid.headers):
+            header.bindtags(header.bindtags() + (select_tag,))
+            for row in self.entry_grid.rows:
+                row[i].bindtags(row[i].bindtags() + (select_tag,))
+
+        self.move_page_up_btn = tk.Button(self, text='^\n^',
+                                          command=lambda: self.move_up(
+                                              page=True)
+                                          )
+        self.move_page_up_btn.grid(row=1, column=4, sticky='NS')
+        self.move_page_up_btn = tk.Button(self, text='^',
+                                          command=self.move_up)
+        self.move_page_up_btn.grid(row=2, column=4, sticky='NS')
+
+        self.move_page_down_btn = tk.Button(self, text='v',
+                                            command=self.move_down)
+        self.move_page_down_btn.grid(row=3, column=4, sticky='NS')
+        self.move_page_down_btn = tk.Button(self, text='v\nv',
+                                            command=lambda: self.move_down(
+                                                page=True)
+                                            )
+        self.move_page_down_btn.grid(row=4, column=4, sticky='NS')
+
+        # add buttons to navigate the spreadsheet
+        self.move_page_left_btn = tk.Button(self, text='<<',
+                                            command=lambda: self.move_left(
+                                                page=True)
+                                            )
+        self.move_page_left_btn.grid(row=5, column=0, sticky='EW')
+        self.move_left_btn = tk.Button(self, text='<', command=self.move_left)
+        self.move_left_btn.grid(row=5, column=1, sticky='EW')
+        self.move_right_btn = tk.Button(self,
+                                        text='>',
+                                        command=self.move_right)
+        self.move_right_btn.grid(row=5, column=2, sticky='EW')
+        self.move_page_right_btn = tk.Button(self,
+                                             text='>>',
+                                             command=lambda: self.move_right(
+                                                 page=True)
+                                             )
+        self.move_page_right_btn.grid(row=5, column=3, sticky='EW')
+
+        # jump straight to a cell, such as 'C1200' or a row number
+        self.jump_label = tk.Label(self, text='Go to:')
+        self.jump_label.grid(row=6, column=0, sticky='E')
+        self.jump_entry = tk.Entry(self)
+        self.jump_entry.grid(row=6, column=1, columnspan=2, sticky='EW')
+        self.jump_entry.bind('<Return>', lambda e: self._jump_entered())
+        self.jump_btn = tk.Button(self, text='Go',
+                                  command=self._jump_entered)
+        self.jump_btn.grid(row=6, column=3, sticky='EW')
+
+        # find cells by their contents; Return moves to the next match
+        self.find_label = tk.Label(self, text='Find:')
+        self.find_label.grid(row=7, column=0, sticky='E')
+        self.find_entry = tk.Entry(self)
+        self.find_entry.grid(row=7, column=1, columnspan=2, sticky='EW')
+        self.find_entry.bind('<Return>', lambda e: self._find_entered())
+        self.find_btn = tk.Button(self, text='Find',
+                                  command=self._find_entered)
+        self.find_btn.grid(row=7, column=3, sticky='EW')
+
+        self._index = None
+        self._index_tokens = None
+        self._index_signature = None
+        self._index_result = queue.Queue()
+        self._indexing = False
+        self._pending_find = None
+        self._hits = list()
+        self._hit_number = 0
+        self._hits_text = None
+
+        self.path = path
+        self.sheetname = sheetname
+        self.rows_to_display = rows_to_display
+        self.cols_to_display = cols_do_display
+        self.current_position = (0, 0)
+
+        self._worker = threading.Thread(target=self._work, daemon=True)
+        self._worker.start()
+        self._jobs.put(functools.partial(self._load, self._generation))
+        self._poll_id = self.after(50, self._poll_loading)
+        self._index_poll_id = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def destroy(self):
+        for after_id in (self._poll_id, self._index_poll_id,
+                         self._page_poll_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self._poll_id = self._index_poll_id = self._page_poll_id = None
+
+        self._jobs.put(None)
+        self.close()
+        super().destroy()
+
+    def close(self):
+        r"""
+        Release the open workbook; it is re-opened if the reader is \
+        used again.
+
+        :return: None
+        """
+        with self._lock:
+            self._close_backend()
+
+            # a page still being waited for is not read either
+            with self._cache_lock:
+                self._wanted_page = None
+
+    def _close_backend(self):
+        with self._lock:
+            if self._backend is not None:
+                self._backend.close()
+
+            self._backend = None
+            self._backend_signature = None
+
+            # queued jobs are dropped rather than re-opening the file
+            with self._cache_lock:
+                self._blocks.clear()
+                self._blocks_epoch += 1
+                self._queued_blocks.clear()
+                self._generation += 1
+
+    def _open_backend(self):
+        r"""
+        The backend reading the open file, re-opened only if the \
+        modification time or size of the file has changed since it was \
+        opened.
+
+        :return: the ``ReaderBackend``
+        """
+        with self._lock:
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime, stat.st_size)
+
+            if self._backend is None or \
+                    signature != self._backend_signature:
+                self._close_backend()
+                self._backend = self._backend_class(self.path)
+                self._backend_signature = signature
+
+            return self._backend
+
+    def _work(self):
+        r"""
+        Runs jobs in the background thread until a None job is received
+        """
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+
+            job()
+
+    def _load(self, generation: int):
+        try:
+            self._block(self.sheetname if self.sheetname else 0, 0, 0,
+                        generation=generation)
+            self._load_result.put(None)
+        except Exception as e:
+            self._load_result.put(e)
+
+    def _poll_loading(self):
+        r"""
+        Checks, on the tk thread, whether the background load has finished
+        """
+        try:
+            error = self._load_result.get_nowait()
+        except queue.Empty:
+            self._poll_id = self.after(50, self._poll_loading)
+            return
+
+        self._poll_id = None
+
+        if error is not None:
+            self.header.config(text='Unable to open {}'.format(self.path))
+            raise error
+
+        self.header.config(text=self.header_text)
+        self._loaded = True
+        self.read_xl(*self.current_position, sheetname=self.sheetname)
+
+    def _block(self, key, block_row: int, block_column: int,
+               generation: int=None):
+        r"""
+        A block of decoded cell values, from the cache if possible
+
+        :param key: the name or index of the sheet
+        :param block_row: the row of the block, in blocks
+        :param block_column: the column of the block, in blocks
+        :param generation: for background jobs, the generation they were \
+        queued in; the block is not read if the reader has been closed \
+        or has moved on since
+        :return: a list of rows of values, or None if not read
+        """
+        cache_key = (key, block_row, block_column)
+
+        with self._cache_lock:
+            block = self._blocks.get(cache_key)
+            if block is not None:
+                self._blocks.move_to_end(cache_key)
+                return block
+
+        first_row = block_row * self.rows_to_display
+        first_col = block_column * self.cols_to_display
+
+        with self._lock:
+            # the block may have been read while waiting for the backend
+            with self._cache_lock:
+                block = self._blocks.get(cache_key)
+                epoch = self._blocks_epoch
+                stale = generation is not None and \
+                    generation != self._generation
+            if block is not None or stale:
+                return block
+
+            block = self._open_backend().read(
+                key, first_row, first_row + self.rows_to_display,
+                first_col, first_col + self.cols_to_display)
+
+        with self._cache_lock:
+            # blocks read before the file was re-opened are not kept
+            if epoch == self._blocks_epoch:
+                self._blocks[cache_key] = block
+                if len(self._blocks) > self.max_cached_blocks:
+                    self._blocks.popitem(last=False)
+
+        return block
+
+    def _prefetch_block(self, cache_key):
+        with self._cache_lock:
+            # the pages this block was queued for have been left behind
+            generation = self._generation
+            if self._queued_blocks.get(cache_key) != generation:
+                self._queued_blocks.pop(cache_key, None)
+                return
+
+        try:
+            self._block(*cache_key, generation=generation)
+        except Exception:
+            # prefetching is only an optimisation; errors surface when
+            # the block is actually displayed
+            pass
+        finally:
+            with self._cache_lock:
+                self._queued_blocks.pop(cache_key, None)
+
+    def _prefetch(self, key, row_number: int, column_number: int):
+        r"""
+        Queue the blocks around a page for decoding in the background
+        """
+        first_block_row = row_number // self.rows_to_display
+        first_block_col = column_number // self.cols_to_display
+
+        # jobs queued for earlier pages are dropped unless re-queued here
+        with self._cache_lock:
+            self._generation += 1
+            generation = self._generation
+
+        for block_row in range(first_block_row - 1, first_block_row + 3):
+            for block_col in range(first_block_col - 1, first_block_col + 3):
+                if block_row < 0 or block_col < 0:
+                    continue
+
+                cache_key = (key, block_row, block_col)
+                with self._cache_lock:
+                    if cache_key in self._blocks:
+                        continue
+
+                    queued = cache_key in self._queued_blocks
+                    self._queued_blocks[cache_key] = generation
+                    if queued:
+                        continue
+
+                self._jobs.put(
+                    lambda cache_key=cache_key:
+                        self._prefetch_block(cache_key))
+
+    def _read_page(self, key, row_number: int, column_number: int):
+        r"""
+        The values of a page, assembled from the decoded blocks
+
+        :return: a list of rows of values
+        """
+        rows, cols = self.rows_to_display, self.cols_to_display
+        first_block_col = column_number // cols
+        last_block_col = (column_number + cols - 1) // cols
+
+        data = list()
+        for row in range(row_number, row_number + rows):
+            block_row, i = divmod(row, rows)
+            blocks = [self._block(key, block_row, block_col)
+                      for block_col in range(first_block_col,
+                                             last_block_col + 1)]
+            if i >= len(blocks[0]):
+                break  # past the last row of the sheet
+
+            values = list()
+            for block in blocks:
+                values.extend(block[i])
+
+            start = column_number - first_block_col * cols
+            data.append(values[start:start + cols])
+
+        return data
+
+    def read_xl(self, row_number=0, column_number=0,
+                sheetname=None, sheetnum=0):
+        if not self._loaded:
+            return
+
+        key = sheetname if sheetname else sheetnum
+        page = (key, row_number, column_number)
+
+        if self._page_cached(*page):
+            with self._cache_lock:
+                self._wanted_page = None
+            self._show_page(page, self._read_page(*page))
+        else:
+            # reading far into a sheet, such as indexing the lines of a
+            # large CSV file, is left to the worker thread
+            self._request_page(page)
+
+    def _page_cached(self, key, row_number: int, column_number: int):
+        r"""
+        Whether all blocks of a page are in the cache, so that it can be \
+        displayed without reading the file
+        """
+        rows, cols = self.rows_to_display, self.cols_to_display
+        block_cols = range(column_number // cols,
+                           (column_number + cols - 1) // cols + 1)
+
+        with self._cache_lock:
+            for block_row in range(row_number // rows,
+                                   (row_number + rows - 1) // rows + 1):
+                blocks = [self._blocks.get((key, block_row, block_col))
+                          for block_col in block_cols]
+                if any(block is None for block in blocks):
+                    return False
+                if len(blocks[0]) < rows:
+                    break  # the last rows of the sheet
+
+        return True
+
+    def _show_page(self, page, data: list):
+        key, row_number, column_number = page
+        self.entry_grid.fill_window(data)
+        self._update_columns(column_number)
+
+        self._prefetch(key, row_number, column_number)
+
+    def _request_page(self, page):
+        r"""
+        Queue a page to be read by the worker thread, showing that the \
+        reader is busy until it is displayed; only the last page \
+        requested is read
+        """
+        with self._cache_lock:
+            self._wanted_page = page
+
+        if self._page_poll_id is None:
+            self._header_before_reading = self.header.cget('text')
+            self.header.config(text='Reading {}...'.format(self.path))
+            self._page_poll_id = self.after(20, self._poll_page)
+
+        self._jobs.put(functools.partial(self._load_page, page))
+
+    def _load_page(self, page):
+        with self._cache_lock:
+            if page != self._wanted_page:
+                return  # the reader has moved on or been closed
+
+        try:
+            self._page_result.put((page, self._read_page(*page)))
+        except Exception as e:
+            self._page_result.put((page, e))
 
-        :param key: the name and dict accessor
-        :param default: the default value
-        :param unit_label: the label that should be \
-        applied at the right of the entry
-        :param enable: the 'enabled' state (defaults to True)
-        :return:
+    def _poll_page(self):
+        r"""
+        Checks, on the tk thread, whether the requested page has been read
         """
-        self.keys.append(tk.Label(self, text=key))
+        self._page_poll_id = None
 
-        self.defaults.append(default)
-        self.unit_labels.append(
-            tk.Label(self, text=unit_label if unit_label else '')
-        )
-        self.enables.append(enable)
-        self.values.append(tk.Entry(self))
+        while True:
+            try:
+                page, result = self._page_result.get_nowait()
+            except queue.Empty:
+                break
 
-        row_offset = 1 if self.title is not None else 0
+            with self._cache_lock:
+                if page != self._wanted_page:
+                    continue  # a page which has been left behind
+                self._wanted_page = None
 
-        for i in range(len(self.keys)):
-            self.keys[i].grid_forget()
+            self._end_reading()
+            if isinstance(result, Exception):
+                self.header.config(text='Unable to read {}'.format(
+                    self.path))
+                raise result
 
-            self.keys[i].grid(row=row_offset, column=0, sticky='e')
-            self.values[i].grid(row=row_offset, column=1)
+            self._show_page(page, result)
+            return
 
-            if self.unit_labels[i]:
-                self.unit_labels[i].grid(row=row_offset, column=3, sticky='w')
+        with self._cache_lock:
+            waiting = self._wanted_page is not None
 
-            if self.defaults[i]:
-                self.values[i].config(state=tk.NORMAL)
-                self.values[i].delete(0, tk.END)
-                self.values[i].insert(0, self.defaults[i])
+        if waiting:
+            self._page_poll_id = self.after(20, self._poll_page)
+        else:
+            self._end_reading()
 
-            if self.enables[i] in [True, None]:
-                self.values[i].config(state=tk.NORMAL)
-            elif self.enables[i] is False:
-                self.values[i].config(state=tk.DISABLED)
+    def _end_reading(self):
+        # the header is left alone if something else has been shown since
+        if self.header.cget('text') == 'Reading {}...'.format(self.path):
+            self.header.config(text=self._header_before_reading)
 
-            row_offset += 1
+    def _update_columns(self, column_number: int):
+        r"""
+        Label the headers with the displayed columns and highlight the \
+        selected column if it is displayed
+        """
+        for i, header in enumerate(self.entry_grid.headers):
+            letter = _column_letter(column_number + i)
+            if letter != self._header_letters[i]:
+                header.config(text=letter)
+                self._header_letters[i] = letter
+
+        highlighted = None
+        if self.selected_column is not None:
+            highlighted = self.selected_column - column_number
+            if not 0 <= highlighted < self.cols_to_display:
+                highlighted = None
+
+        if highlighted == self._highlighted:
+            return
 
-            # strip <Return> and <Tab> bindings, add callbacks to all entries
-            self.values[i].unbind('<Return>')
-            self.values[i].unbind('<Tab>')
+        for i in (self._highlighted, highlighted):
+            if i is None:
+                continue
 
-            if self.callback is not None:
-                def callback(event):
-                    self.callback()
+            selected = i == highlighted
+            header = self.entry_grid.headers[i]
+            header.config(relief=tk.SUNKEN if selected else tk.GROOVE)
+            for row in self.entry_grid.rows:
+                background = self.selected_background \
+                    if selected else self._cell_background
+                row[i].config(background=background,
+                              readonlybackground=background)
 
-                self.values[i].bind('<Return>', callback)
-                self.values[i].bind('<Tab>', callback)
+        self._highlighted = highlighted
 
-    def reset(self):
-        """
-        Clears all entries.
+    def _column_clicked(self, event):
+        # headers and cells are both gridded in their column of the page
+        i = int(event.widget.grid_info()['column'])
+        self.select_column(self.current_position[1] + i)
+
+    def select_column(self, column: int):
+        r"""
+        Select a column, as if it had been clicked
 
+        :param column: the index of the column (starting at 0)
         :return: None
         """
-        for i in range(len(self.values)):
-            self.values[i].delete(0, tk.END)
+        if self._cell_background is None:
+            self._cell_background = \
+                self.entry_grid.rows[0][0].cget('background')
 
-            if self.defaults[i] is not None:
-                self.values[i].insert(0, self.defaults[i])
+        self.selected_column = column
+        self.header.config(text='Column {} selected'.format(
+            _column_letter(column)))
+        self._update_columns(self.current_position[1])
 
-    def change_enables(self, enables_list: list):
-        """
-        Enable/disable inputs.
+        if self.on_column_select is not None:
+            self.on_column_select(column)
 
-        :param enables_list: list containing enables for each key
-        :return: None
+    def iter_column(self, column: int, start_row: int=0):
+        r"""
+        Iterate over the values of a column, read from the sheet as \
+        they are consumed rather than all at once.  Empty cells are \
+        None or ''.::
+
+            for value in reader.iter_column(2, start_row=1):
+                ...
+
+        :param column: the index of the column (starting at 0)
+        :param start_row: the first row (starting at 0)
+        :return: a generator of values
         """
-        for i, entry in enumerate(self.values):
-            if enables_list[i]:
-                entry.config(state=tk.NORMAL)
-            else:
-                entry.config(state=tk.DISABLED)
+        key = self.sheetname if self.sheetname else 0
+        with self._lock:
+            backend = self._open_backend()
+            values = backend.iter_column(key, column, start_row)
+
+        # the backend is shared with the worker thread, so it is only
+        # read under the lock, a block of values at a time
+        while True:
+            with self._lock:
+                if backend is not self._backend:
+                    raise RuntimeError('{} was closed or changed while '
+                                       'reading it'.format(self.path))
+                batch = list(itertools.islice(values, 1024))
+
+            for value in batch:
+                yield value
+
+            if len(batch) < 1024:
+                return
+
+    def read_column(self, column: int=None, start_row: int=0,
+                    dtype=None):
+        r"""
+        Read all values of a column from ``start_row`` onwards.  With a \
+        ``dtype`` the values are converted to numbers as they are read \
+        (empty cells become NaN, so only floating point types are \
+        accepted):
+
+         - None returns a list of the values as they are stored
+         - the ``array`` typecode 'f' or 'd' returns an ``array``
+         - a floating point numpy dtype, such as 'float32', is passed \
+           to ``numpy.fromiter`` (requires numpy)
+
+        :param column: the index of the column; defaults to the \
+        selected column
+        :param start_row: the first row (starting at 0)
+        :param dtype: the type of the values returned
+        :return: a list, array or numpy array
+        """
+        if column is None:
+            column = self.selected_column
+        if column is None:
+            raise ValueError('no column selected')
 
-    def load(self, data: dict):
+        if dtype is None:
+            return list(self.iter_column(column, start_row))
+
+        if isinstance(dtype, str) and dtype in array.typecodes:
+            if dtype not in 'fd':
+                raise ValueError('empty cells cannot be stored in an '
+                                 'array of typecode {!r}'.format(dtype))
+
+            values = self.iter_column(column, start_row)
+            return array.array(dtype, (_to_number(v) for v in values))
+
+        import numpy
+        if numpy.dtype(dtype).kind != 'f':
+            raise ValueError('empty cells cannot be stored in an '
+                             'array of dtype {!r}'.format(dtype))
+
+        values = self.iter_column(column, start_row)
+        return numpy.fromiter((_to_number(v) for v in values), dtype=dtype)
+
+    def _build_index(self):
+        r"""
+        Build, in a background thread, an index of the lower-case words \
+        in the cells of the sheet to their (row, column) positions
         """
-        Load values into the key/values via dict.
+        key = self.sheetname if self.sheetname else 0
+        index = dict()
+
+        try:
+            with self._lock:
+                backend = self._open_backend()
+                signature = self._backend_signature
+                rows = backend.iter_rows(key)
+
+            row = 0
+            while True:
+                with self._lock:
+                    batch = list(itertools.islice(rows, 1024))
+
+                for values in batch:
+                    for column, value in enumerate(values):
+                        if value is None or value == '':
+                            continue
+
+                        for token in set(_tokens(str(value))):
+                            index.setdefault(token, []).append((row, column))
+
+                    row += 1
+
+                if len(batch) < 1024:
+                    break
+        except Exception as e:
+            self._index_result.put(e)
+            return
 
-        :param data: dict containing the key/values that should be inserted
-        :return: None
+        self._index_result.put((index, sorted(index), signature))
+
+    def _poll_index(self):
+        r"""
+        Checks, on the tk thread, whether the index has been built
         """
-        for i, label in enumerate(self.keys):
-            key = label.cget('text')
-            if key in data.keys():
-                entry_was_enabled = True if \
-                    self.values[i].cget('state') == 'normal' else False
-                if not entry_was_enabled:
-                    self.values[i].config(state='normal')
+        try:
+            result = self._index_result.get_nowait()
+        except queue.Empty:
+            self._index_poll_id = self.after(100, self._poll_index)
+            return
 
-                self.values[i].delete(0, tk.END)
-                self.values[i].insert(0, str(data[key]))
+        self._index_poll_id = None
 
-                if not entry_was_enabled:
-                    self.values[i].config(state='disabled')
+        self._indexing = False
+        if isinstance(result, Exception):
+            self.header.config(text='Unable to search {}'.format(self.path))
+            raise result
 
-    def get(self):
-        """
-        Retrieve the GUI elements for program use.
+        self._index, self._index_tokens, self._index_signature = result
+        self.header.config(text=self.header_text)
 
-        :return: a dictionary containing all \
-        of the data from the key/value entries
+        if self._pending_find is not None:
+            text, self._pending_find = self._pending_find, None
+            self.find(text)
+
+    def _index_is_current(self):
+        with self._lock:
+            self._open_backend()
+            return self._index is not None and \
+                self._index_signature == self._backend_signature
+
+    def find(self, text: str):
+        r"""
+        Find the cells containing words starting with each word of \
+        ``text`` (case insensitive) and display the first of them.  \
+        The sheet is indexed in the background the first time; the \
+        search then runs once the index is ready, and returns None.
+
+        :param text: the text to search for
+        :return: a sorted list of (row, column) tuples, or None while \
+        the sheet is being indexed
         """
-        data = dict()
-        for label, entry in zip(self.keys, self.values):
-            data[label.cget('text')] = entry.get()
+        if not self._index_is_current():
+            self._pending_find = text
+            if not self._indexing:
+                self._indexing = True
+                self.header.config(text='Indexing {}...'.format(self.path))
+                threading.Thread(target=self._build_index,
+                                 daemon=True).start()
+                self._index_poll_id = self.after(100, self._poll_index)
+            return None
 
-        return data
+        hits = None
+        for word in _tokens(text):
+            cells = set()
+            i = bisect.bisect_left(self._index_tokens, word)
+            while i < len(self._index_tokens) and \
+                    self._index_tokens[i].startswith(word):
+                cells.update(self._index[self._index_tokens[i]])
+                i += 1
 
+            hits = cells if hits is None else hits & cells
 
-class SpreadSheetReader(tk.Frame):
-    def __init__(self, parent, path, rows_to_display=20, cols_do_display=8,
-                 sheetname=None, **options):
-        tk.Frame.__init__(self, parent, **options)
+        self._hits = sorted(hits) if hits else list()
+        self._hit_number = 0
+        self._hits_text = text
 
-        self.header = tk.Label(self,
-                               text='Select the column you wish to import')
-        self.header.grid(row=0, column=0, columnspan=4)
+        if self._hits:
+            self._show_hit()
+        else:
+            self.header.config(text='{!r} not found'.format(text))
+            self.bell()
 
-        self.entry_grid = EntryGrid(self, num_of_columns=8)
-        self.entry_grid.grid(row=1, column=0, columnspan=4, rowspan=4)
+        return self._hits
 
-        self.move_page_up_btn = tk.Button(self, text='^\n^',
-                                          command=lambda: self.move_up(
-                                              page=True)
-                                          )
-        self.move_page_up_btn.grid(row=1, column=4, sticky='NS')
-        self.move_page_up_btn = tk.Button(self, text='^',
-                                          command=self.move_up)
-        self.move_page_up_btn.grid(row=2, column=4, sticky='NS')
+    def find_next(self):
+        r"""
+        Display the next cell found by the last :meth:`find`
 
-        self.move_page_down_btn = tk.Button(self, text='v',
-                                            command=self.move_down)
-        self.move_page_down_btn.grid(row=3, column=4, sticky='NS')
-        self.move_page_down_btn = tk.Button(self, text='v\nv',
-                                            command=lambda: self.move_down(
-                                                page=True)
-                                            )
-        self.move_page_down_btn.grid(row=4, column=4, sticky='NS')
+        :return: None
+        """
+        if not self._hits:
+            return
 
-        # add buttons to navigate the spreadsheet
-        self.move_page_left_btn = tk.Button(self, text='<<',
-                                            command=lambda: self.move_left(
-                                                page=True)
-                                            )
-        self.move_page_left_btn.grid(row=5, column=0, sticky='EW')
-        self.move_left_btn = tk.Button(self, text='<', command=self.move_left)
-        self.move_left_btn.grid(row=5, column=1, sticky='EW')
-        self.move_right_btn = tk.Button(self,
-                                        text='>',
-                                        command=self.move_right)
-        self.move_right_btn.grid(row=5, column=2, sticky='EW')
-        self.move_page_right_btn = tk.Button(self,
-                                             text='>>',
-                                             command=lambda: self.move_right(
-                                                 page=True)
-                                             )
-        self.move_page_right_btn.grid(row=5, column=3, sticky='EW')
+        self._hit_number = (self._hit_number + 1) % len(self._hits)
+        self._show_hit()
 
-        self.path = path
-        self.sheetname = sheetname
-        self.rows_to_display = rows_to_display
-        self.cols_to_display = cols_do_display
-        self.current_position = (0, 0)
+    def _show_hit(self):
+        row, column = self._hits[self._hit_number]
+        self.jump_to(row, column)
 
-        self.read_xl(sheetname=self.sheetname)
+        self.header.config(text='{} of {}: {}{}'.format(
+            self._hit_number + 1, len(self._hits),
+            _column_letter(column), row + 1))
 
-    def read_xl(self, row_number=0, column_number=0,
-                sheetname=None, sheetnum=0):
-        workbook = xlrd.open_workbook(self.path)
+        # the cell is displayed at the top left of the page
+        entry = self.entry_grid.rows[0][0]
+        entry.focus_set()
+        entry.selection_range(0, tk.END)
+
+    def _find_entered(self):
+        text = self.find_entry.get()
+        if not text.strip():
+            return
 
-        if sheetname:
-            sheet = workbook.sheet_by_name(sheetname)
+        if text == self._hits_text and self._hits:
+            self.find_next()
         else:
-            sheet = workbook.sheet_by_index(sheetnum)
+            self.find(text)
 
-        for i, row in enumerate(sheet.get_rows()):
-            if i >= row_number:
-                data = row[column_number:column_number + self.cols_to_display]
-                data = [point.value for point in data]
-                self.entry_grid.add_row(data=data)
+    def jump_to(self, row_number: int, column_number: int=None):
+        r"""
+        Display the page starting at a cell
 
-            if i >= (self.rows_to_display + row_number):
-                break
+        :param row_number: the row of the cell (starting at 0)
+        :param column_number: the column of the cell (starting at 0); \
+        None keeps the current column
+        :return: None
+        """
+        if column_number is None:
+            column_number = self.current_position[1]
+
+        self.current_position = (max(row_number, 0), max(column_number, 0))
+        self.read_xl(*self.current_position, sheetname=self.sheetname)
+
+    def _jump_entered(self):
+        try:
+            row, column = _parse_cell_reference(self.jump_entry.get())
+        except ValueError:
+            self.bell()
+            return
+
+        self.jump_to(row, column)
 
     def move_right(self, page=False):
         row_pos, col_pos = self.current_position
-        self.entry_grid.clear()
 
         if page:
             self.current_position = (row_pos, col_pos + self.cols_to_display)
@@ -532,8 +2962,6 @@ class SpreadSheetReader(tk.Frame):
         if page and col_pos < self.cols_to_display:
             return
 
-        self.entry_grid.clear()
-
         if page:
             self.current_position = (row_pos, col_pos - self.cols_to_display)
         else:
@@ -542,7 +2970,6 @@ class SpreadSheetReader(tk.Frame):
 
     def move_down(self, page=False):
         row_pos, col_pos = self.current_position
-        self.entry_grid.clear()
 
         if page:
             self.current_position = (row_pos + self.rows_to_display, col_pos)
@@ -559,8 +2986,6 @@ class SpreadSheetReader(tk.Frame):
         if page and row_pos < self.rows_to_display:
             return
 
-        self.entry_grid.clear()
-
         if page:
             self.current_position = (row_pos - self.rows_to_display, col_pos)
         else:
@@ -568,6 +2993,7 @@ class SpreadSheetReader(tk.Frame):
         self.read_xl(*self.current_position, sheetname=self.sheetname)
 
 
+@functools.lru_cache(maxsize=32)
 def _get_calendar(locale, fwday):
     # instantiate proper calendar class
     if locale is None:
@@ -576,9 +3002,77 @@ def _get_calendar(locale, fwday):
         return calendar.LocaleTextCalendar(fwday, locale)
 
 
+@functools.lru_cache(maxsize=32)
+def _week_header(locale, fwday):
+    r"""
+    The abbreviated weekday names, starting at the first day of the week
+
+    :param locale: the locale of the names, or None
+    :param fwday: the first day of the week
+    :return: a tuple of names
+    """
+    return tuple(_get_calendar(locale, fwday).formatweekheader(3).split())
+
+
+@functools.lru_cache(maxsize=512)
+def _month_layout(locale, fwday, year: int, month: int):
+    r"""
+    The title and the day numbers of a month, as shown by the calendars.  \
+    Layouts are cached, as locale calendars switch the process locale \
+    to format month names.
+
+    :param locale: the locale of the month name, or None
+    :param fwday: the first day of the week
+    :param year: the year
+    :param month: the month (1 to 12)
+    :return: a tuple of the title, such as 'January 2020', and 6 weeks \
+    of 7 day numbers as two-digit strings, '' outside the month
+    """
+    cal = _get_calendar(locale, fwday)
+    title = cal.formatmonthname(year, month, 0).strip().title()
+
+    weeks = [tuple(('%02d' % day) if day else '' for day in week)
+             for week in cal.monthdayscalendar(year, month)]
+    while len(weeks) < 6:
+        weeks.append(('',) * 7)
+
+    return title, tuple(weeks)
+
+
+# the widths of texts in named fonts, shared by all widgets
+_text_widths = dict()
+
+
+def _text_width(widget, text: str, font: str='TkDefaultFont'):
+    r"""
+    Measure text in a named font, remembering the width for later
+
+    :param widget: any widget of the application
+    :param text: the text to measure
+    :param font: the name of an existing font
+    :return: the width in pixels
+    """
+    key = (font, text)
+    width = _text_widths.get(key)
+    if width is None:
+        width = Font(root=widget, name=font, exists=True).measure(text)
+        _text_widths[key] = width
+
+    return width
+
+
 class Calendar(ttk.Frame):
     r"""
-    Graphical date selection widget, with callbacks.
+    Graphical date selection widget, with callbacks.  Shift-clicking a \
+    date selects the range of dates from the last date clicked.  Dates \
+    with events can be marked using :meth:`mark_dates`; as the cells of \
+    the calendar cannot be coloured individually, marked and selected \
+    days are decorated using ``mark_format`` and ``range_format``.::
+
+        cal = Calendar(root)
+        cal.mark_dates([datetime.date(2020, 3, 2),
+                        (datetime.date(2020, 3, 9),
+                         datetime.date(2020, 4, 3))])
 
     :param parent: the parent frame
     :param callback: the callable to be executed on selection
@@ -587,6 +3081,9 @@ class Calendar(ttk.Frame):
     timedelta = datetime.timedelta
     datetime = datetime.datetime
 
+    mark_format = '{}\u2022'
+    range_format = '[{}]'
+
     def __init__(self, parent, callback=None, **kwargs):
         # remove custom options from kw before initializing ttk.Frame
         fwday = calendar.SUNDAY
@@ -598,10 +3095,17 @@ class Calendar(ttk.Frame):
 
         self._date = self.datetime(year, month, 1)
         self._selection = None  # no date selected
+        self._anchor = None
+        self._range = None
         self.callback = callback
 
+        # the marked days of each (year, month)
+        self._marks = dict()
+
         super().__init__(parent, **kwargs)
 
+        self._locale = locale
+        self._fwday = fwday
         self._cal = _get_calendar(locale, fwday)
 
         self.__setup_styles()       # creates custom styles
@@ -614,6 +3118,7 @@ class Calendar(ttk.Frame):
         self._items = [
             self._calendar.insert('', 'end', values='') for _ in range(6)
         ]
+        self._weeks = [None] * 6
 
         # insert dates in the currently empty calendar
         self._build_calendar()
@@ -677,22 +3182,20 @@ class Calendar(ttk.Frame):
         self._calendar.pack(in_=self, expand=1, fill='both', side='bottom')
 
     def __config_calendar(self):
-        cols = self._cal.formatweekheader(3).split()
+        cols = _week_header(self._locale, self._fwday)
 
         self._calendar['columns'] = cols
         self._calendar.tag_configure('header', background='grey90')
         self._calendar.insert('', 'end', values=cols, tag='header')
 
         # adjust its columns width
-        font = Font()
-        maxwidth = max(font.measure(col) for col in cols)
+        maxwidth = max(_text_width(self, col) for col in cols)
         for col in cols:
             self._calendar.column(
                 col, width=maxwidth, minwidth=maxwidth, anchor='e'
             )
 
     def __setup_selection(self, sel_bg, sel_fg):
-        self._font = Font()
         self._canvas = canvas = tk.Canvas(
             self._calendar, background=sel_bg,
             borderwidth=0, highlightthickness=0
@@ -711,16 +3214,94 @@ class Calendar(ttk.Frame):
     def _build_calendar(self):
         year, month = self._date.year, self._date.month
 
+        header, weeks = _month_layout(self._locale, self._fwday,
+                                      year, month)
+
         # update header text (Month, YEAR)
-        header = self._cal.formatmonthname(year, month, 0)
-        self._header['text'] = header.title()
+        self._header['text'] = header
+
+        marks = self._marks.get((year, month), ())
+        first, last = self._range_days(year, month)
+        if marks or first:
+            weeks = [tuple(self._decorate(text, marks, first, last)
+                           for text in week) for week in weeks]
 
-        # update calendar shown dates
-        cal = self._cal.monthdayscalendar(year, month)
+        # update calendar shown dates, leaving unchanged weeks alone
         for indx, item in enumerate(self._items):
-            week = cal[indx] if indx < len(cal) else []
-            fmt_week = [('%02d' % day) if day else '' for day in week]
-            self._calendar.item(item, values=fmt_week)
+            if weeks[indx] != self._weeks[indx]:
+                self._calendar.item(item, values=weeks[indx])
+                self._weeks[indx] = weeks[indx]
+
+    def _decorate(self, text: str, marks: set, first: int, last: int):
+        if not text:
+            return text
+
+        day = int(text)
+        if day in marks:
+            text = self.mark_format.format(text)
+        if first <= day <= last:
+            text = self.range_format.format(text)
+
+        return text
+
+    def _range_days(self, year: int, month: int):
+        r"""
+        The first and last days of a month within the selected range, \
+        or (0, -1)
+        """
+        if self._range is None:
+            return 0, -1
+
+        start, end = self._range
+        if (end.year, end.month) < (year, month) or \
+                (start.year, start.month) > (year, month):
+            return 0, -1
+
+        first = start.day if (start.year, start.month) == (year, month) \
+            else 1
+        last = end.day if (end.year, end.month) == (year, month) \
+            else calendar.monthrange(year, month)[1]
+
+        return first, last
+
+    def mark_dates(self, events):
+        r"""
+        Mark the dates of events.  Dates are indexed by month, so that \
+        displaying a month only looks up its marked days.
+
+        :param events: an iterable of dates, and of (start, end) tuples \
+        of dates marking every day from start to end inclusive
+        :return: None
+        """
+        for event in events:
+            if hasattr(event, 'year'):
+                start = end = event
+            else:
+                start, end = event
+
+            year, month = start.year, start.month
+            while (year, month) <= (end.year, end.month):
+                first = start.day if (year, month) == \
+                    (start.year, start.month) else 1
+                last = end.day if (year, month) == (end.year, end.month) \
+                    else calendar.monthrange(year, month)[1]
+
+                self._marks.setdefault((year, month), set()).update(
+                    range(first, last + 1))
+
+                year, month = (year + 1, 1) if month == 12 \
+                    else (year, month + 1)
+
+        self._build_calendar()
+
+    def clear_marks(self):
+        r"""
+        Remove the marks of all dates
+
+        :return: None
+        """
+        self._marks.clear()
+        self._build_calendar()
 
     def _show_selection(self, text, bbox):
         r"""
@@ -728,7 +3309,7 @@ class Calendar(ttk.Frame):
         """
         x, y, width, height = bbox
 
-        textw = self._font.measure(text)
+        textw = _text_width(self, text)
 
         canvas = self._canvas
         canvas.configure(width=width, height=height)
@@ -762,8 +3343,23 @@ class Calendar(ttk.Frame):
         if not bbox:  # calendar not visible yet
             return
 
+        # strip any mark or range decoration from the day
+        day = int(''.join(c for c in str(text) if c.isdigit()))
+        date = self.datetime(self._date.year, self._date.month, day)
+
+        # shift-click selects the range from the last date clicked
+        previous = self._range
+        if evt.state & 0x0001 and self._anchor is not None:
+            self._range = (min(self._anchor, date), max(self._anchor, date))
+        else:
+            self._anchor = date
+            self._range = None
+
+        if self._range != previous:
+            self._build_calendar()
+
         # update and then show selection
-        text = '%02d' % text
+        text = '%02d' % day
         self._selection = (text, item, column)
         self._show_selection(text, bbox)
 
@@ -811,3 +3407,210 @@ class Calendar(ttk.Frame):
 
         year, month = self._date.year, self._date.month
         return self.datetime(year, month, int(self._selection[0]))
+
+    @property
+    def selection_range(self):
+        r"""
+        Return a tuple of datetimes of the first and last dates of the \
+        range selected by shift-clicking, or None.
+        """
+        return self._range
+
+
+class YearCalendar(ttk.Frame):
+    r"""
+    Displays the 12 months of a year as text drawn on a single canvas, \
+    with callbacks on selecting a date.  Clicks are located by \
+    arithmetic on their coordinates and changing the year only changes \
+    the text of the drawn items.::
+
+        def selected():
+            print(year_calendar.selection)
+
+        year_calendar = YearCalendar(root, 2020, callback=selected)
+
+    :param parent: the parent frame
+    :param year: the year displayed; defaults to the current year
+    :param callback: the callable to be executed on selection
+    :param locale: the locale of the month and weekday names, or None
+    :param firstweekday: the first day of the week
+    :param months_per_row: the number of months drawn side by side
+    :param kwargs: tkinter.frame keyword arguments
+    """
+    datetime = datetime.datetime
+
+    header_color = 'grey90'
+    selected_color = '#ecffc4'
+    cell_height = 18
+    padding = 8
+
+    def __init__(self, parent, year: int=None, callback: callable=None,
+                 locale=None, firstweekday: int=calendar.SUNDAY,
+                 months_per_row: int=3, **kwargs):
+        super().__init__(parent, **kwargs)
+
+        self.year = year if year is not None else self.datetime.now().year
+        self.callback = callback
+        self._locale = locale
+        self._fwday = firstweekday
+        self._months_per_row = months_per_row
+        self._selection = None
+
+        # header with the year and buttons changing it
+        hframe = ttk.Frame(self)
+        hframe.pack(side='top', pady=4, anchor='center')
+        ttk.Button(hframe, text='<', width=3,
+                   command=lambda: self.set_year(self.year - 1)).grid(
+            row=0, column=0)
+        self._header = ttk.Label(hframe, width=8, anchor='center')
+        self._header.grid(row=0, column=1, padx=12)
+        ttk.Button(hframe, text='>', width=3,
+                   command=lambda: self.set_year(self.year + 1)).grid(
+            row=0, column=2)
+
+        days = _week_header(locale, firstweekday)
+        self._cell_width = max(_text_width(self, text)
+                               for text in days + ('00',)) + 6
+
+        # each month is a title, the weekdays and 6 weeks of days
+        self._month_width = 7 * self._cell_width + self.padding
+        self._month_height = 8 * self.cell_height + self.padding
+        rows = -(-12 // months_per_row)
+
+        self._canvas = canvas = tk.Canvas(
+            self, width=months_per_row * self._month_width,
+            height=rows * self._month_height,
+            borderwidth=0, highlightthickness=0)
+        canvas.pack(side='bottom', expand=1, fill='both')
+
+        self._highlight = canvas.create_rectangle(
+            0, 0, 0, 0, fill=self.selected_color, outline='',
+            state=tk.HIDDEN)
+
+        self._titles = list()
+        self._days = list()
+        self._texts = list()
+
+        for month in range(12):
+            x, y = self._month_origin(month)
+            canvas.create_rectangle(
+                x, y + self.cell_height,
+                x + 7 * self._cell_width, y + 2 * self.cell_height,
+                fill=self.header_color, outline='')
+
+            self._titles.append(canvas.create_text(
+                x + 7 * self._cell_width / 2, y + self.cell_height / 2))
+
+            for column, text in enumerate(days):
+                canvas.create_text(*self._cell_center(month, -1, column),
+                                   text=text)
+
+            items = [canvas.create_text(*self._cell_center(month, week, day),
+                                        anchor='center')
+                     for week in range(6) for day in range(7)]
+            self._days.append(items)
+            self._texts.append([''] * 42)
+
+        canvas.bind('<ButtonPress-1>', self._pressed)
+
+        self.set_year(self.year)
+
+    def _month_origin(self, month: int):
+        row, column = divmod(month, self._months_per_row)
+        return column * self._month_width, row * self._month_height
+
+    def _cell_center(self, month: int, week: int, day: int):
+        r"""
+        The center of the cell of a day of the week; week -1 is the row \
+        of weekday names
+        """
+        x, y = self._month_origin(month)
+        return (x + (day + 0.5) * self._cell_width,
+                y + (week + 2.5) * self.cell_height)
+
+    def set_year(self, year: int):
+        r"""
+        Display a year
+
+        :param year: the year
+        :return: None
+        """
+        self.year = year
+        self._header['text'] = str(year)
+
+        canvas = self._canvas
+        for month in range(12):
+            title, weeks = _month_layout(self._locale, self._fwday,
+                                         year, month + 1)
+            canvas.itemconfigure(self._titles[month],
+                                 text=title.rsplit(' ', 1)[0])
+
+            # only the days whose text changes are updated
+            shown = self._texts[month]
+            items = self._days[month]
+            for i, text in enumerate(itertools.chain(*weeks)):
+                if text != shown[i]:
+                    canvas.itemconfigure(items[i], text=text)
+                    shown[i] = text
+
+        self._show_selection()
+
+    def _pressed(self, event):
+        r"""
+        Clicked somewhere in the year; the day is found from the \
+        coordinates rather than by searching the canvas items.
+        """
+        x = self._canvas.canvasx(event.x)
+        y = self._canvas.canvasy(event.y)
+
+        column, x = divmod(int(x), self._month_width)
+        row, y = divmod(int(y), self._month_height)
+        if column >= self._months_per_row:
+            return
+
+        month = row * self._months_per_row + column
+        day = x // self._cell_width
+        week = y // self.cell_height - 2
+        if not 0 <= month < 12 or not 0 <= day < 7 or not 0 <= week < 6:
+            return
+
+        text = self._texts[month][week * 7 + day]
+        if not text:
+            return
+
+        self._selection = self.datetime(self.year, month + 1, int(text))
+        self._show_selection()
+
+        if self.callback is not None:
+            self.callback()
+
+    def _show_selection(self):
+        canvas = self._canvas
+        if self._selection is None or self._selection.year != self.year:
+            canvas.itemconfigure(self._highlight, state=tk.HIDDEN)
+            return
+
+        month = self._selection.month - 1
+        text = '%02d' % self._selection.day
+        index = self._texts[month].index(text)
+
+        x, y = self._cell_center(month, index // 7, index % 7)
+        w, h = self._cell_width / 2, self.cell_height / 2
+        canvas.coords(self._highlight, x - w, y - h, x + w, y + h)
+        canvas.itemconfigure(self._highlight, state=tk.NORMAL)
+
+    def add_callback(self, callback: callable):
+        r"""
+        Adds a callback to call when the user clicks on a date
+
+        :param callback: a callable function
+        :return: None
+        """
+        self.callback = callback
+
+    @property
+    def selection(self):
+        r"""
+        Return a datetime representing the current selected date.
+        """
+        return self._selection
@@ -0,0 +1,661 @@
+import datetime
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import xlrd
+
+from tk_tools.sources import CsvSource
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+
+class ReaderBackend:
+    r"""
+    Reads ranges of cells from a spreadsheet file for the \
+    ``SpreadSheetReader`` (intended to be subclassed).  Sheets are \
+    referred to by name (str) or by index (int).
+
+    :param path: the path to the file
+    """
+    extensions = ()
+    cacheable = True
+    rows_per_read = 4096
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def sheet_names(self):
+        r"""
+        The names of the sheets in the file
+
+        :return: a list of sheet names
+        """
+        raise NotImplementedError
+
+    def dimensions(self, sheet):
+        r"""
+        The size of a sheet
+
+        :param sheet: the name or index of the sheet
+        :return: a tuple of (rows, columns)
+        """
+        raise NotImplementedError
+
+    def read(self, sheet, first_row: int, last_row: int,
+             first_col: int, last_col: int):
+        r"""
+        Read a rectangular range of cell values.  Fewer rows are \
+        returned at the end of the sheet, and rows may be shorter than \
+        requested where they end.
+
+        :param sheet: the name or index of the sheet
+        :param first_row: the first row
+        :param last_row: the row after the last row
+        :param first_col: the first column
+        :param last_col: the column after the last column
+        :return: a list of rows, each a list of values
+        """
+        raise NotImplementedError
+
+    def iter_rows(self, sheet, start_row: int=0):
+        r"""
+        Iterate over the rows of a sheet, reading them a block at a time
+
+        :param sheet: the name or index of the sheet
+        :param start_row: the first row
+        :return: a generator of lists of values
+        """
+        ncols = self.dimensions(sheet)[1]
+        last_col = sys.maxsize if ncols is None else ncols
+
+        row = start_row
+        while True:
+            rows = self.read(sheet, row, row + self.rows_per_read,
+                             0, last_col)
+            for values in rows:
+                yield values
+
+            if len(rows) < self.rows_per_read:
+                return
+            row += self.rows_per_read
+
+    def iter_column(self, sheet, column: int, start_row: int=0):
+        r"""
+        Iterate over the values of a column without reading the whole \
+        sheet; empty cells are None or ''.
+
+        :param sheet: the name or index of the sheet
+        :param column: the column
+        :param start_row: the first row
+        :return: a generator of values
+        """
+        row = start_row
+        while True:
+            rows = self.read(sheet, row, row + self.rows_per_read,
+                             column, column + 1)
+            for values in rows:
+                yield values[0] if values else None
+
+            if len(rows) < self.rows_per_read:
+                return
+            row += self.rows_per_read
+
+    def close(self):
+        r"""
+        Release the file
+
+        :return: None
+        """
+        pass
+
+
+class XlrdBackend(ReaderBackend):
+    r"""
+    Reads ``.xls`` workbooks using ``xlrd``, with random access to rows.
+    """
+    extensions = ('.xls',)
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._workbook = xlrd.open_workbook(path, on_demand=True)
+        self._sheets = dict()
+
+    def _sheet(self, sheet):
+        r"""
+        A sheet of the workbook, cached by both name and index
+        """
+        cached = self._sheets.get(sheet)
+        if cached is None:
+            if isinstance(sheet, str):
+                cached = self._workbook.sheet_by_name(sheet)
+            else:
+                cached = self._workbook.sheet_by_index(sheet)
+
+            self._sheets[cached.name] = cached
+            self._sheets[cached.number] = cached
+
+        return cached
+
+    def sheet_names(self):
+        return self._workbook.sheet_names()
+
+    def dimensions(self, sheet):
+        sheet = self._sheet(sheet)
+        return sheet.nrows, sheet.ncols
+
+    def read(self, sheet, first_row: int, last_row: int,
+             first_col: int, last_col: int):
+        sheet = self._sheet(sheet)
+        last_row = min(last_row, sheet.nrows)
+
+        return [
+            [cell.value for cell in sheet.row_slice(i, first_col, last_col)]
+            for i in range(first_row, last_row)
+        ]
+
+    def iter_column(self, sheet, column: int, start_row: int=0):
+        sheet = self._sheet(sheet)
+        for i in range(start_row, sheet.nrows):
+            if column < sheet.row_len(i):
+                yield sheet.cell_value(i, column)
+            else:
+                yield None
+
+    def close(self):
+        self._workbook.release_resources()
+        self._sheets.clear()
+
+
+class OpenpyxlBackend(ReaderBackend):
+    r"""
+    Reads ``.xlsx`` workbooks using ``openpyxl`` in read-only mode, which \
+    streams the sheet rather than loading it into memory.  Requires the \
+    optional ``openpyxl`` package.
+    """
+    extensions = ('.xlsx', '.xlsm')
+
+    def __init__(self, path: str):
+        if openpyxl is None:
+            raise ImportError('openpyxl is required to read {}'.format(path))
+
+        super().__init__(path)
+        self._workbook = openpyxl.load_workbook(path, read_only=True,
+                                                data_only=True)
+
+    def sheet_names(self):
+        return self._workbook.sheetnames
+
+    def _worksheet(self, sheet):
+        if not isinstance(sheet, str):
+            sheet = self._workbook.sheetnames[sheet]
+        return self._workbook[sheet]
+
+    def dimensions(self, sheet):
+        worksheet = self._worksheet(sheet)
+        if worksheet.max_row is None or worksheet.max_column is None:
+            worksheet.calculate_dimension(force=True)
+
+        return worksheet.max_row or 0, worksheet.max_column or 0
+
+    def read(self, sheet, first_row: int, last_row: int,
+             first_col: int, last_col: int):
+        worksheet = self._worksheet(sheet)
+
+        # openpyxl counts rows and columns from 1
+        if worksheet.max_row is not None:
+            last_row = min(last_row, worksheet.max_row)
+        if first_row >= last_row:
+            return []
+
+        rows = worksheet.iter_rows(min_row=first_row + 1, max_row=last_row,
+                                   min_col=first_col + 1, max_col=last_col,
+                                   values_only=True)
+        return [list(row) for row in rows]
+
+    def iter_rows(self, sheet, start_row: int=0):
+        rows = self._worksheet(sheet).iter_rows(min_row=start_row + 1,
+                                                values_only=True)
+        for values in rows:
+            yield list(values)
+
+    def iter_column(self, sheet, column: int, start_row: int=0):
+        # a single pass of the stream, rather than one per block of rows
+        rows = self._worksheet(sheet).iter_rows(
+            min_row=start_row + 1, min_col=column + 1, max_col=column + 1,
+            values_only=True)
+        for values in rows:
+            yield values[0] if values else None
+
+    def close(self):
+        self._workbook.close()
+
+
+class CsvBackend(ReaderBackend):
+    r"""
+    Reads CSV and TSV files as a single sheet, using a memory-mapped \
+    index of line offsets so that reading row N is a seek rather than a \
+    scan.
+    """
+    extensions = ('.csv', '.tsv', '.tab', '.txt')
+    cacheable = False  # already read straight from a memory map
+
+    def __init__(self, path: str):
+        super().__init__(path)
+
+        fmtparams = dict()
+        if os.path.splitext(path)[1].lower() in ('.tsv', '.tab'):
+            fmtparams['delimiter'] = '\t'
+
+        self._source = CsvSource(path, **fmtparams)
+
+    def sheet_names(self):
+        return [os.path.splitext(os.path.basename(self.path))[0]]
+
+    def dimensions(self, sheet):
+        return len(self._source), None
+
+    def iter_rows(self, sheet, start_row: int=0):
+        # the lines are indexed as they are read; the dimensions would
+        # index the whole file before the first row
+        row = start_row
+        while True:
+            rows = self._source.rows(row, row + self.rows_per_read)
+            for values in rows:
+                yield values
+
+            if len(rows) < self.rows_per_read:
+                return
+            row += self.rows_per_read
+
+    def read(self, sheet, first_row: int, last_row: int,
+             first_col: int, last_col: int):
+        return [row[first_col:last_col]
+                for row in self._source.rows(first_row, last_row)]
+
+    def close(self):
+        self._source.close()
+
+
+class ColumnarCacheBackend(ReaderBackend):
+    r"""
+    Wraps another backend with an on-disk cache of converted sheets.  \
+    The first time a sheet is read it is converted to a compact columnar \
+    file (per column: a type code per cell, doubles for the numbers, \
+    booleans, dates and times, and a string table for any text; other \
+    values are stored as text) in \
+    ``directory``, named from the path, modification time and size of \
+    the spreadsheet.  Later reads memory-map that file rather than \
+    parsing the spreadsheet, which is only opened when a sheet has to be \
+    converted.  The least recently used files are deleted once the \
+    directory exceeds ``max_bytes``.
+
+    :param path: the path to the spreadsheet
+    :param backend: the ``ReaderBackend`` subclass which reads the file
+    :param directory: the cache directory
+    :param max_bytes: the maximum total size of the cached files
+    """
+    suffix = '.tkcol'
+    magic = b'TKCOL2\n'
+    rows_per_read = 4096
+
+    def __init__(self, path: str, backend: type, directory: str,
+                 max_bytes: int=1 << 30):
+        super().__init__(path)
+
+        self.backend = backend
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        os.makedirs(directory, exist_ok=True)
+        stat = os.stat(path)
+        self._key = '{}|{}|{}'.format(os.path.abspath(path),
+                                      stat.st_mtime, stat.st_size)
+        self._inner = None
+        self._sheets = dict()
+
+    def _cache_path(self, sheet):
+        key = '{}|{}|{!r}'.format(self._key, type(sheet).__name__, sheet)
+        name = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name + self.suffix)
+
+    def _inner_backend(self):
+        if self._inner is None:
+            self._inner = self.backend(self.path)
+        return self._inner
+
+    def _sheet(self, sheet):
+        columnar = self._sheets.get(sheet)
+        if columnar is not None:
+            return columnar
+
+        path = self._cache_path(sheet)
+        if os.path.exists(path):
+            # record the use for least-recently-used eviction
+            os.utime(path)
+
+            try:
+                columnar = _ColumnarSheet(path, self.magic)
+            except (ValueError, TypeError, OSError, struct.error, KeyError):
+                # a truncated, corrupt or foreign file is converted again
+                os.remove(path)
+
+        if columnar is None:
+            self._convert(sheet, path)
+            self._evict(keep=path)
+            columnar = _ColumnarSheet(path, self.magic)
+
+        self._sheets[sheet] = columnar
+        return columnar
+
+    def _convert(self, sheet, path):
+        r"""
+        Write a sheet of the spreadsheet to a columnar cache file
+
+        :param sheet: the name or index of the sheet
+        :param path: the path of the cache file
+        :return: None
+        """
+        inner = self._inner_backend()
+        ncols = inner.dimensions(sheet)[1]
+
+        # a single pass of the sheet, encoding the values as they are read
+        encoders = [_ColumnEncoder() for _ in range(ncols)]
+        rows_read = 0
+        for row in inner.iter_rows(sheet):
+            length = len(row)
+            for j, encoder in enumerate(encoders):
+                encoder.append(row[j] if j < length else None)
+
+            rows_read += 1
+
+        sections = [encoder.sections() for encoder in encoders]
+
+        header = {'nrows': rows_read, 'ncols': ncols, 'columns': []}
+        position = 0
+        for parts in sections:
+            lengths = [len(part) for part in parts]
+            header['columns'].append({'offset': position,
+                                      'lengths': lengths})
+            position += sum(_padded(length) for length in lengths)
+
+        encoded = json.dumps(header).encode('utf-8')
+
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as f:
+            f.write(self.magic)
+            f.write(struct.pack('<I', len(encoded)))
+            f.write(encoded)
+            f.write(b'\0' * (_padded(f.tell()) - f.tell()))
+
+            for parts in sections:
+                for part in parts:
+                    f.write(part)
+                    f.write(b'\0' * (_padded(len(part)) - len(part)))
+
+        os.replace(temporary, path)
+
+    def _evict(self, keep: str=None):
+        r"""
+        Delete the least recently used cache files until the cache \
+        directory fits within ``max_bytes``
+
+        :param keep: a cache file which must not be deleted
+        :return: None
+        """
+        entries = list()
+        for name in os.listdir(self.directory):
+            if name.endswith(self.suffix):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+
+            path = os.path.join(self.directory, name)
+            if path == keep:
+                continue
+
+            try:
+                os.remove(path)
+            except OSError:
+                continue  # still mapped by another reader on some systems
+            total -= size
+
+    def sheet_names(self):
+        return self._inner_backend().sheet_names()
+
+    def dimensions(self, sheet):
+        columnar = self._sheet(sheet)
+        return columnar.nrows, columnar.ncols
+
+    def read(self, sheet, first_row: int, last_row: int,
+             first_col: int, last_col: int):
+        return self._sheet(sheet).read(first_row, last_row,
+                                       first_col, last_col)
+
+    def iter_column(self, sheet, column: int, start_row: int=0):
+        columnar = self._sheet(sheet)
+        if column >= columnar.ncols:
+            return iter(())
+
+        return (columnar.value(i, column)
+                for i in range(start_row, columnar.nrows))
+
+    def close(self):
+        for columnar in self._sheets.values():
+            columnar.close()
+        self._sheets.clear()
+
+        if self._inner is not None:
+            self._inner.close()
+            self._inner = None
+
+
+def _padded(length: int):
+    return (length + 7) // 8 * 8
+
+
+_EMPTY, _FLOAT, _INT, _TEXT, _BOOL, _DATETIME, _DATE, _TIME, _TIMEDELTA = \
+    range(9)
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+class _ColumnEncoder:
+    r"""
+    Encodes the values of a column, as they are appended, into a type \
+    code per cell, an array of doubles holding the numbers (and the \
+    booleans, dates and times) and a table of strings holding the text.
+    """
+    def __init__(self):
+        self.kinds = array('B')
+        self.numbers = array('d')
+        self.offsets = array('Q', [0])
+        self.text = bytearray()
+
+    def append(self, value):
+        kind, number = _EMPTY, 0.0
+
+        if value is None or value == '':
+            pass
+        elif isinstance(value, bool):
+            kind, number = _BOOL, float(value)
+        elif isinstance(value, int):
+            kind, number = _INT, float(value)
+        elif isinstance(value, float):
+            kind, number = _FLOAT, value
+        elif isinstance(value, datetime.datetime) and value.tzinfo is None:
+            kind = _DATETIME
+            number = (value - _EPOCH).total_seconds()
+        elif isinstance(value, datetime.date) and \
+                not isinstance(value, datetime.datetime):
+            kind, number = _DATE, float(value.toordinal())
+        elif isinstance(value, datetime.time) and value.tzinfo is None:
+            kind = _TIME
+            number = value.hour * 3600 + value.minute * 60 + \
+                value.second + value.microsecond / 1e6
+        elif isinstance(value, datetime.timedelta):
+            kind, number = _TIMEDELTA, value.total_seconds()
+        else:
+            kind = _TEXT
+            self.text += str(value).encode('utf-8')
+
+        self.kinds.append(kind)
+        self.numbers.append(number)
+        self.offsets.append(len(self.text))
+
+    def sections(self):
+        r"""
+        The encoded column; the string table is left empty for columns \
+        without text
+
+        :return: a list of bytes sections
+        """
+        if not self.text:
+            return [self.kinds.tobytes(), self.numbers.tobytes(), b'', b'']
+
+        return [self.kinds.tobytes(), self.numbers.tobytes(),
+                self.offsets.tobytes(), bytes(self.text)]
+
+
+def _decode_value(kind: int, number: float):
+    r"""
+    The value of a cell whose type code is neither text nor empty
+    """
+    if kind == _FLOAT:
+        return number
+    elif kind == _INT:
+        return int(number)
+    elif kind == _BOOL:
+        return bool(number)
+    elif kind == _DATETIME:
+        return _EPOCH + datetime.timedelta(seconds=number)
+    elif kind == _DATE:
+        return datetime.date.fromordinal(int(number))
+    elif kind == _TIME:
+        microseconds = int(round(number * 1e6))
+        seconds, microsecond = divmod(microseconds, 1000000)
+        minutes, second = divmod(seconds, 60)
+        hour, minute = divmod(minutes, 60)
+        return datetime.time(hour, minute, second, microsecond)
+    elif kind == _TIMEDELTA:
+        return datetime.timedelta(seconds=number)
+
+    return None
+
+
+class _ColumnarSheet:
+    r"""
+    A memory-mapped columnar cache file
+
+    :param path: the path of the cache file
+    :param magic: the bytes which start a valid cache file
+    """
+    def __init__(self, path: str, magic: bytes):
+        self._views = list()
+        self._map = None
+        self._file = open(path, 'rb')
+
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+
+            if self._map[:len(magic)] != magic:
+                raise ValueError(
+                    '{} is not a columnar cache file'.format(path))
+
+            self._parse(magic)
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self, magic: bytes):
+        r"""
+        Read the header of the file and locate the sections of each column
+        """
+        length, = struct.unpack_from('<I', self._map, len(magic))
+        start = len(magic) + 4
+        header = json.loads(self._map[start:start + length].decode('utf-8'))
+        data_start = _padded(start + length)
+
+        self.nrows = header['nrows']
+        self.ncols = header['ncols']
+
+        view = memoryview(self._map)
+        self._views.append(view)
+        self._columns = list()
+        for column in header['columns']:
+            position = data_start + column['offset']
+            sections = list()
+            for length in column['lengths']:
+                sections.append(view[position:position + length])
+                position += _padded(length)
+
+            kinds, numbers, offsets, text = sections
+            self._views.extend(sections)
+
+            numbers = numbers.cast('d')
+            if len(offsets):
+                offsets = offsets.cast('Q')
+            self._views.extend([numbers, offsets])
+
+            self._columns.append((kinds, numbers, offsets, text))
+
+    def value(self, row: int, column: int):
+        kinds, numbers, offsets, text = self._columns[column]
+        kind = kinds[row]
+
+        if kind == _FLOAT:
+            return numbers[row]
+        elif kind == _TEXT:
+            return bytes(text[offsets[row]:offsets[row + 1]]).decode('utf-8')
+        elif kind == _EMPTY:
+            return None
+
+        return _decode_value(kind, numbers[row])
+
+    def read(self, first_row: int, last_row: int,
+             first_col: int, last_col: int):
+        last_row = min(last_row, self.nrows)
+        last_col = min(last_col, self.ncols)
+
+        return [[self.value(i, j) for j in range(first_col, last_col)]
+                for i in range(first_row, last_row)]
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = list()
+
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+backends = [XlrdBackend, OpenpyxlBackend, CsvBackend]
+
+
+def backend_for(path: str):
+    r"""
+    Choose the backend which reads a file, based upon its extension
+
+    :param path: the path to the file
+    :return: a ``ReaderBackend`` subclass
+    """
+    extension = os.path.splitext(path)[1].lower()
+    for backend in backends:
+        if extension in backend.extensions:
+            return backend
+
+    raise ValueError('no spreadsheet backend reads "{}" files'.format(
+        extension))
@@ -0,0 +1,342 @@
+import csv
+import io
+import mmap
+import os
+import re
+import sqlite3
+import sys
+from array import array
+from collections import OrderedDict
+
+_NEWLINE = re.compile(b'\n')
+_SCAN_CHUNK = 1 << 20
+
+
+class DataSource:
+    r"""
+    Protocol for row data which is fetched on demand rather than pushed \
+    into a widget row by row (intended to be subclassed).  A data source \
+    has a length and returns ranges of rows as lists of values.
+    """
+    def __len__(self):
+        raise NotImplementedError
+
+    def length_hint(self):
+        r"""
+        The number of rows, or an estimate of it while counting them \
+        would be expensive, such as before a file has been indexed to \
+        its end.  Used to size scrollbars without forcing ``len()``.
+
+        :return: the number of rows
+        """
+        return len(self)
+
+    def rows(self, start: int, stop: int):
+        r"""
+        Fetch a range of rows
+
+        :param start: the index of the first row
+        :param stop: the index after the last row
+        :return: a list of rows, each a list of values
+        """
+        raise NotImplementedError
+
+    def invalidate(self):
+        r"""
+        Discard anything cached about the underlying data
+
+        :return: None
+        """
+        pass
+
+    def close(self):
+        r"""
+        Release any file or connection held by the data source
+
+        :return: None
+        """
+        pass
+
+
+class ListSource(DataSource):
+    r"""
+    A data source over rows held in memory.
+
+    :param data: a list of rows
+    """
+    def __init__(self, data: list):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    def rows(self, start: int, stop: int):
+        return [list(row) for row in self.data[start:stop]]
+
+
+class CsvSource(DataSource):
+    r"""
+    A data source over a CSV file.  The file is memory-mapped and the \
+    byte offsets of the line starts are indexed as far as rows have been \
+    requested, so opening the file costs nothing and reading a range of \
+    rows is a slice of the map rather than a scan.  ``len()`` completes \
+    the index, while ``length_hint()`` estimates the number of rows from \
+    the part of the file indexed so far.  Quoted fields spanning several \
+    lines are not supported.
+
+    :param path: the path to the CSV file
+    :param encoding: the encoding of the file
+    :param skip_header: True if the first line should be skipped
+    :param fmtparams: formatting parameters passed to ``csv.reader``
+    """
+    def __init__(self, path: str, encoding: str='utf-8',
+                 skip_header: bool=False, **fmtparams):
+        self.path = path
+        self.encoding = encoding
+        self.skip_header = skip_header
+        self.fmtparams = fmtparams
+
+        self._file = None
+        self._map = None
+        self._size = 0
+        self._offsets = None
+        self._scanned = 0
+        self._complete = False
+
+    def __len__(self):
+        self._index_to(sys.maxsize)
+        return len(self._offsets) - 1
+
+    def length_hint(self):
+        if self._offsets is None:
+            self._open()
+
+        rows = len(self._offsets) - 1
+        if self._complete or not self._scanned:
+            return rows
+
+        # the rows indexed so far, scaled up to the size of the file
+        return max(rows, round(rows * self._size / self._scanned))
+
+    def _open(self):
+        r"""
+        Map the file into memory and start the index of line offsets
+
+        :return: None
+        """
+        self._file = open(self.path, 'rb')
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._map = b''
+        if self._size:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+
+        self._offsets = array('Q', [0])
+        self._scanned = 0
+        self._complete = False
+
+        if self.skip_header:
+            self._index_to(1)
+            if len(self._offsets) > 1:
+                self._offsets = self._offsets[1:]
+
+    def _index_to(self, row: int):
+        r"""
+        Extend the index of line offsets until it holds the end of \
+        ``row - 1``, or the end of the file is reached.  The map is \
+        scanned a chunk at a time rather than one line at a time.
+
+        :param row: the row which must be indexed
+        :return: None
+        """
+        if self._offsets is None:
+            self._open()
+
+        offsets = self._offsets
+
+        while not self._complete and len(offsets) <= row:
+            position = self._scanned
+            end = min(position + _SCAN_CHUNK, self._size)
+            offsets.extend(match.end() for match in
+                           _NEWLINE.finditer(self._map, position, end))
+            self._scanned = end
+
+            if end == self._size:
+                # a final line without a line ending
+                if offsets[-1] < self._size:
+                    offsets.append(self._size)
+                self._complete = True
+
+    def rows(self, start: int, stop: int):
+        self._index_to(stop)
+        stop = min(stop, len(self._offsets) - 1)
+        if start >= stop:
+            return []
+
+        raw = self._map[self._offsets[start]:self._offsets[stop]]
+        text = io.StringIO(raw.decode(self.encoding), newline='')
+        return list(csv.reader(text, **self.fmtparams))
+
+    def close(self):
+        if self._map:
+            self._map.close()
+        if self._file is not None:
+            self._file.close()
+
+        self._file = None
+        self._map = None
+        self._offsets = None
+        self._scanned = 0
+        self._complete = False
+
+    def invalidate(self):
+        self.close()
+
+
+def _quote(identifier: str):
+    return '"{}"'.format(identifier.replace('"', '""'))
+
+
+class SqliteSource(DataSource):
+    r"""
+    A data source over a table of a local sqlite3 database.  Rows are \
+    ordered by ``key`` and fetched using keyset pagination; the key of \
+    the last row of every fetch is remembered so that the next range \
+    starts with an indexed ``key > ?`` lookup rather than an ``OFFSET`` \
+    scan.::
+
+        source = SqliteSource('log.db', 'samples',
+                              columns=['time', 'value'],
+                              where='channel = ?', parameters=(3,))
+
+    :param database: an open ``sqlite3.Connection`` or a path
+    :param table: the name of the table
+    :param columns: the names of the columns; None for all columns
+    :param key: a unique, ordered column; defaults to the rowid
+    :param where: an optional SQL condition limiting the rows
+    :param parameters: the parameters of the ``where`` condition
+    """
+    def __init__(self, database, table: str, columns: list=None,
+                 key: str='rowid', where: str=None, parameters: tuple=()):
+        if isinstance(database, sqlite3.Connection):
+            self.connection = database
+        else:
+            self.connection = sqlite3.connect(database)
+
+        columns = '*' if columns is None else \
+            ', '.join(_quote(c) for c in columns)
+        self._select = 'SELECT {}, {} FROM {}'.format(
+            _quote(key), columns, _quote(table))
+        self._count = 'SELECT COUNT(*) FROM {}'.format(_quote(table))
+        self._key = _quote(key)
+        self._where = where
+        self._parameters = tuple(parameters)
+
+        self._length = None
+        self._keys = dict()
+
+    def __len__(self):
+        if self._length is None:
+            query = self._count
+            if self._where:
+                query += ' WHERE ' + self._where
+
+            cursor = self.connection.execute(query, self._parameters)
+            self._length = cursor.fetchone()[0]
+
+        return self._length
+
+    def rows(self, start: int, stop: int):
+        if start >= stop:
+            return []
+
+        # resume from the closest row before start whose key is known
+        known = [i for i in self._keys if i < start]
+        conditions = [self._where] if self._where else []
+        parameters = list(self._parameters)
+        offset = start
+
+        if known:
+            previous = max(known)
+            conditions.append('{} > ?'.format(self._key))
+            parameters.append(self._keys[previous])
+            offset = start - previous - 1
+
+        query = self._select
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(
+                '({})'.format(c) for c in conditions)
+        query += ' ORDER BY {} LIMIT ? OFFSET ?'.format(self._key)
+        parameters += [stop - start, offset]
+
+        result = self.connection.execute(query, parameters).fetchall()
+        if result:
+            self._keys[start + len(result) - 1] = result[-1][0]
+
+        return [list(row[1:]) for row in result]
+
+    def invalidate(self):
+        self._length = None
+        self._keys.clear()
+
+
+class CachedSource(DataSource):
+    r"""
+    Wraps a data source with a least-recently-used cache of fixed-size \
+    blocks of rows, so that scrolling back and forth does not fetch the \
+    same rows again.
+
+    :param source: the data source to wrap
+    :param block_size: the number of rows per block
+    :param max_blocks: the number of blocks kept in the cache
+    """
+    def __init__(self, source: DataSource, block_size: int=256,
+                 max_blocks: int=64):
+        self.source = source
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self._blocks = OrderedDict()
+
+    def __len__(self):
+        return len(self.source)
+
+    def length_hint(self):
+        hint = getattr(self.source, 'length_hint', None)
+        return hint() if hint is not None else len(self.source)
+
+    def _block(self, number: int):
+        block = self._blocks.get(number)
+        if block is not None:
+            self._blocks.move_to_end(number)
+            return block
+
+        start = number * self.block_size
+        block = self.source.rows(start, start + self.block_size)
+        self._blocks[number] = block
+        if len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+
+        return block
+
+    def rows(self, start: int, stop: int):
+        # blocks past the end are empty, so the length is not needed
+        if start >= stop:
+            return []
+
+        data = list()
+        first = start // self.block_size
+        last = (stop - 1) // self.block_size
+        for number in range(first, last + 1):
+            offset = number * self.block_size
+            block = self._block(number)
+            data.extend(block[max(start - offset, 0):stop - offset])
+
+        return data
+
+    def invalidate(self):
+        self._blocks.clear()
+        self.source.invalidate()
+
+    def close(self):
+        self._blocks.clear()
+        self.source.close()
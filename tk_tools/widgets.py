@@ -1,4 +1,147 @@
 import tkinter as tk
+import bisect
+import contextlib
+import difflib
+import time
+
+
+# the batches of batch_updates() being run, innermost last
+_batches = list()
+
+
+class _Batch:
+    r"""
+    The smart widgets changed, and the callbacks suppressed, during a \
+    :func:`batch_updates` block.
+    """
+    def __init__(self, callback: callable=None):
+        self.callback = callback
+        self.widgets = set()
+        self.callbacks = dict()
+
+    def record(self, widget, callback: callable):
+        self.widgets.add(widget)
+        self.callbacks[callback] = None
+
+    def merge(self, batch):
+        r"""
+        Take over the changes of a nested batch
+
+        :param batch: the nested batch
+        :return: None
+        """
+        self.widgets |= batch.widgets
+        if batch.callback is None:
+            self.callbacks.update(batch.callbacks)
+        else:
+            widgets = set(batch.widgets)
+            self.callbacks[lambda: batch.callback(widgets)] = None
+
+    def fire(self):
+        if self.callback is not None:
+            if self.widgets:
+                self.callback(self.widgets)
+            return
+
+        for callback in self.callbacks:
+            callback()
+
+
+@contextlib.contextmanager
+def batch_updates(callback: callable=None):
+    r"""
+    Set many smart widgets without calling their callbacks for every \
+    change.  When the block ends, each callback of the changed widgets \
+    is called once, or only ``callback`` is called with the set of \
+    changed widgets.  Nested blocks are reported when the outermost \
+    block ends.  Nothing is called if the block raises an exception.::
+
+        with tk_tools.batch_updates():
+            for name, value in saved.items():
+                widgets[name].set(value)
+
+    :param callback: a callable taking the set of changed widgets, \
+    called instead of the callbacks of the widgets
+    :return: a context manager
+    """
+    batch = _Batch(callback)
+    _batches.append(batch)
+
+    try:
+        yield batch
+    finally:
+        _batches.pop()
+
+    # only reached when the block completes; a block which raised is
+    # not reported, and its exception is not replaced by a callback's
+    if _batches:
+        _batches[-1].merge(batch)
+    else:
+        batch.fire()
+
+
+class _CoalescedCallback:
+    r"""
+    Calls a callback once per burst of changes to a widget, with the \
+    latest value of the widget.
+
+    :param widget: the smart widget
+    :param callback: callable function taking the value
+    :param debounce_ms: call once no change has occurred for this time
+    :param throttle_ms: call at most once per this time
+    """
+    def __init__(self, widget, callback: callable, debounce_ms: int=None,
+                 throttle_ms: int=None):
+        self.widget = widget
+        self.callback = callback
+        self.debounce_ms = debounce_ms
+        self.throttle_ms = throttle_ms
+
+        self._after_id = None
+        self._last_call = None
+        self._first_change = None
+
+    def __call__(self, *args):
+        if _batches:
+            _batches[-1].record(self.widget, self._call)
+            return
+
+        now = time.monotonic()
+
+        if self.debounce_ms is None:
+            # a call is already due, and will see the latest value
+            if self._after_id is not None:
+                return
+
+            delay = 0
+            if self._last_call is not None:
+                elapsed = (now - self._last_call) * 1000
+                delay = max(int(self.throttle_ms - elapsed), 0)
+        else:
+            if self._after_id is not None:
+                self.widget.after_cancel(self._after_id)
+            else:
+                self._first_change = now
+
+            delay = self.debounce_ms
+            if self.throttle_ms is not None:
+                # a continuous burst is still reported every throttle_ms
+                waited = (now - self._first_change) * 1000
+                delay = max(min(delay, int(self.throttle_ms - waited)), 0)
+
+        self._after_id = self.widget.after(delay, self._call)
+
+    def _call(self):
+        self._after_id = None
+        self._last_call = time.monotonic()
+
+        try:
+            value = self.widget.var.get()
+        except tk.TclError:
+            # such as an empty IntVar while a number is typed
+            return
+
+        self.callback(value)
 
 
 class SmartWidget:
@@ -8,15 +151,32 @@ class SmartWidget:
     def __init__(self):
         self.var = None
 
-    def add_callback(self, callback: callable):
+    def add_callback(self, callback: callable, debounce_ms: int=None,
+                     throttle_ms: int=None):
         r"""
-        Add a callback on change
+        Add a callback on change.  By default the callback is called, \
+        without arguments, on every change.  With ``debounce_ms`` or \
+        ``throttle_ms`` it is called once per burst of changes with the \
+        latest value, such as while a spinbox arrow is held::
+
+            # recompute once the value settles, and at least every second
+            ssb.add_callback(recompute, debounce_ms=200, throttle_ms=1000)
 
         :param callback: callable function
+        :param debounce_ms: call once no change has occurred for this time
+        :param throttle_ms: call at most once per this time
         :return: None
         """
-        def internal_callback(*args):
-            callback()
+        if debounce_ms is None and throttle_ms is None:
+            def internal_callback(*args):
+                if _batches:
+                    _batches[-1].record(self, callback)
+                else:
+                    callback()
+        else:
+            internal_callback = _CoalescedCallback(
+                self, callback, debounce_ms=debounce_ms,
+                throttle_ms=throttle_ms)
 
         self.var.trace('w', internal_callback)
 
@@ -66,11 +226,168 @@ class SmartOptionMenu(tk.OptionMenu, SmartWidget):
 
         self.option_menu = tk.OptionMenu.__init__(self, parent, self.var,
                                                   *options)
+        self._options = list(options)
 
         if callback is not None:
-            def internal_callback(*args):
-                callback()
-            self.var.trace('w', internal_callback)
+            self.add_callback(callback)
+
+    def set_options(self, options: list, keep_selection: bool=True):
+        r"""
+        Replace the options of the dropdown.  Only the menu entries \
+        which differ between the old and new options are deleted or \
+        inserted, and callbacks are only called if the selected value \
+        changes.
+
+        :param options: a list containing the new drop down options
+        :param keep_selection: True to keep the selected value if it is \
+        one of the new options; otherwise the first option is selected
+        :return: None
+        """
+        options = list(options)
+        menu = self['menu']
+
+        matcher = difflib.SequenceMatcher(a=self._options, b=options,
+                                          autojunk=False)
+
+        # from the end, so that the indexes of earlier entries still hold
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()):
+            if tag in ('replace', 'delete'):
+                menu.delete(i1, i2 - 1)
+            if tag in ('replace', 'insert'):
+                for k, value in enumerate(options[j1:j2]):
+                    menu.insert_command(i1 + k, label=value,
+                                        command=tk._setit(self.var, value))
+
+        self._options = options
+
+        current = self.var.get()
+        if keep_selection and current in options:
+            return
+
+        value = options[0] if options else ''
+        if value != current:
+            self.var.set(value)
+
+
+class SmartSearchMenu(tk.Frame, SmartWidget):
+    r"""
+    Drop down replacement for very long lists of options, with built-in \
+    tracing variable.  Typing in the entry lists the options starting \
+    with its text (case insensitive); clicking a listed option, or \
+    pressing Return, selects it.  The options are kept sorted so that \
+    each keystroke is a binary search, and the list is filled with \
+    further matches only as it is scrolled.::
+
+        ssm = SmartSearchMenu(root, part_numbers)
+        ssm.grid()
+        ssm.add_callback(lambda: print(ssm.get()))
+
+    :param parent: the tk parent frame
+    :param options: a list containing the options
+    :param initial_value: the initial value
+    :param callback: a function
+    :param visible_results: the number of options listed at once
+    :param kwargs: any options that are valid for tkinter.Frame
+    """
+    def __init__(self, parent, options: list, initial_value: str=None,
+                 callback: callable=None, visible_results: int=10,
+                 **kwargs):
+        tk.Frame.__init__(self, parent, **kwargs)
+
+        self.var = tk.StringVar(self)
+        self.var.set(initial_value if initial_value else options[0])
+
+        self._sorted = sorted((str(o).lower(), str(o)) for o in options)
+        self._keys = [key for key, _ in self._sorted]
+        self._visible_results = visible_results
+        self._matches = (0, 0)
+        self._listed = 0
+
+        self._text = tk.StringVar(self)
+        self.entry = tk.Entry(self, textvariable=self._text)
+        self.entry.grid(row=0, column=0, columnspan=2, sticky='EW')
+        self.entry.bind('<Return>', lambda e: self._choose(0))
+        self.entry.bind('<Down>', lambda e: self._focus_list())
+
+        self.listbox = tk.Listbox(self, height=visible_results,
+                                  exportselection=False)
+        self.listbox.grid(row=1, column=0, sticky='NSEW')
+        self.listbox.bind('<ButtonRelease-1>', self._clicked)
+        self.listbox.bind('<Return>', self._clicked)
+
+        scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL,
+                                 command=self.listbox.yview)
+        scrollbar.grid(row=1, column=1, sticky='NS')
+        self.listbox.config(
+            yscrollcommand=lambda first, last: self._list_scrolled(
+                scrollbar, first, last))
+
+        self.columnconfigure(0, weight=1)
+
+        self._text.set(self.var.get())
+        self._text.trace('w', lambda *args: self.search(self._text.get()))
+        self.var.trace('w', lambda *args: self._text.set(self.var.get()))
+        self.search('')
+
+        if callback is not None:
+            self.add_callback(callback)
+
+    def search(self, text: str):
+        r"""
+        List the options starting with ``text`` (case insensitive)
+
+        :param text: the beginning of the options
+        :return: the number of matching options
+        """
+        prefix = text.lower()
+        start = bisect.bisect_left(self._keys, prefix)
+        stop = bisect.bisect_left(self._keys, prefix + '\U0010ffff', start)
+
+        self._matches = (start, stop)
+        self._listed = 0
+        self.listbox.delete(0, tk.END)
+        self._list_more()
+
+        return stop - start
+
+    def _list_more(self):
+        r"""
+        Add the next page of matching options to the list
+        """
+        start, stop = self._matches
+        first = start + self._listed
+        last = min(first + self._visible_results, stop)
+
+        if first < last:
+            self.listbox.insert(
+                tk.END, *(option for _, option in self._sorted[first:last]))
+            self._listed += last - first
+
+    def _list_scrolled(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+
+        # the end of the listed options is visible
+        if float(last) >= 1.0:
+            start, stop = self._matches
+            if start + self._listed < stop:
+                self.after_idle(self._list_more)
+
+    def _focus_list(self):
+        if self.listbox.size():
+            self.listbox.focus_set()
+            self.listbox.selection_clear(0, tk.END)
+            self.listbox.selection_set(0)
+            self.listbox.activate(0)
+
+    def _clicked(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self._choose(selection[0])
+
+    def _choose(self, index: int):
+        if index < self.listbox.size():
+            self.var.set(self.listbox.get(index))
+            self.entry.icursor(tk.END)
 
 
 class SmartSpinBox(tk.Spinbox, SmartWidget):
@@ -105,8 +422,6 @@ class SmartSpinBox(tk.Spinbox, SmartWidget):
         """
         sb_options = options.copy()
 
-        print('sb_options: ', sb_options)
-
         if entry_type == 'str':
             self.var = tk.StringVar()
         elif entry_type == 'int':
@@ -118,12 +433,10 @@ class SmartSpinBox(tk.Spinbox, SmartWidget):
             raise ValueError('Entry type must be "str", "int", or "float"')
 
         sb_options['textvariable'] = self.var
-        tk.Spinbox.__init__(parent, **sb_options)
+        tk.Spinbox.__init__(self, parent, **sb_options)
 
         if callback is not None:
-            def internal_callback(*args):
-                callback()
-            self.var.trace('w', internal_callback)
+            self.add_callback(callback)
 
 
 class SmartCheckbutton(tk.Checkbutton, SmartWidget):
@@ -150,12 +463,10 @@ class SmartCheckbutton(tk.Checkbutton, SmartWidget):
     """
     def __init__(self, parent, callback: callable=None, **options):
         self.var = tk.BooleanVar()
-        tk.Checkbutton.__init__(parent, variable=self.var, **options)
+        tk.Checkbutton.__init__(self, parent, variable=self.var, **options)
 
         if callback is not None:
-            def internal_callback(*args):
-                callback()
-            self.var.trace('w', internal_callback)
+            self.add_callback(callback)
 
 
 class ByteLabel(tk.Label):